@@ -16,6 +16,9 @@ setup(
         "pygments>=2.19.1",
         "windows-curses>=2.4.1; platform_system == 'Windows'",
     ],
+    extras_require={
+        "re2": ["google-re2>=1.1"],
+    },
     python_requires=">=3.8",
     entry_points={
         "console_scripts": [
@@ -5,6 +5,7 @@ Entry point script for EditPy.
 """
 
 import sys
+import time
 import curses
 import argparse
 import os
@@ -34,7 +35,7 @@ def main_with_args(stdscr: 'curses.window') -> None:
 
     curses.use_default_colors()
     curses.curs_set(0)
-    stdscr.timeout(100)
+    stdscr.timeout(WindowManager.INPUT_TIMEOUT)
 
     window_manager = WindowManager(stdscr)
     input_handler = InputHandler(window_manager)
@@ -49,8 +50,7 @@ def main_with_args(stdscr: 'curses.window') -> None:
                 buf.is_code_file = True
                 buf.edit_mode = True
 
-                highlighter = SyntaxHighlighter()
-                buf.language = highlighter.detect_language(filename, '')
+                buf.language = SyntaxHighlighter.detect_language_by_filename(filename)
 
                 window_manager.add_buffer(buf)
                 window_manager.status_message = f"Created new file: {filename}"
@@ -65,19 +65,33 @@ def main_with_args(stdscr: 'curses.window') -> None:
     if not window_manager.buffers:
         window_manager.add_buffer(Buffer())
 
+    needs_redraw = True
+
     try:
         while True:
             current_height, current_width = stdscr.getmaxyx()
             if (current_height, current_width) != (window_manager.height, window_manager.width):
                 window_manager.resize()
+                needs_redraw = True
 
-            window_manager.refresh_all()
+            # Keys that are already queued (a held key or a paste) are handled
+            # before redrawing, but the screen is still updated at FRAME_INTERVAL
+            if needs_redraw and (
+                    time.monotonic() - window_manager.last_refresh_time >= WindowManager.FRAME_INTERVAL
+                    or not window_manager.input_pending()):
+                window_manager.refresh_all()
+                needs_redraw = False
 
             try:
                 ch = stdscr.getch()
-                if ch != -1:
-                    if not input_handler.handle_input(ch):
-                        break
+                if ch == -1:
+                    # Only a status message changes while idle, when it expires
+                    needs_redraw = needs_redraw or window_manager.status_message is not None
+                    continue
+
+                needs_redraw = True
+                if not input_handler.handle_input(ch):
+                    break
             except KeyboardInterrupt:
                 break
             except curses.error:
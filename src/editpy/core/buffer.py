@@ -2,43 +2,246 @@
 Buffer module for handling code editing and hex data manipulation.
 """
 
-from typing import List, Optional, Tuple, Dict, Any
-from dataclasses import dataclass, field
-from collections import deque
+from typing import Iterable, Iterator, List, Optional, Tuple, Dict, Any, Final, Union
+from collections import OrderedDict
+from array import array
+from itertools import islice
+from bisect import bisect_right
 import os
 import mmap
+import time
 from ..core.syntax import SyntaxHighlighter
+from ..core.line_buffer import LineBuffer, MappedLines, utf8_length
+
+# Maps every byte to itself if it is printable ASCII and to '.' otherwise.
+_ASCII_TABLE: Final[bytes] = bytes(b if 32 <= b <= 126 else 0x2E for b in range(256))
+_ASCII_LOWER_TABLE: Final[bytes] = _ASCII_TABLE.lower()
+
+# Maps printable bytes (including tab, LF and CR) to 0 and everything else to 1.
+_PRINTABLE_MARK: Final[bytes] = bytes(
+    0 if 32 <= b <= 126 or b in (9, 10, 13) else 1 for b in range(256)
+)
+
+# Shared single-byte objects, so byte edits do not build a list and a bytes per call.
+_BYTE_VALUES: Final[Tuple[bytes, ...]] = tuple(bytes((b,)) for b in range(256))
+
+_MADVISE_OPTIONS: Final[Dict[str, Optional[int]]] = {
+    'normal': getattr(mmap, 'MADV_NORMAL', None),
+    'sequential': getattr(mmap, 'MADV_SEQUENTIAL', None),
+    'random': getattr(mmap, 'MADV_RANDOM', None),
+}
+_MADV_WILLNEED: Final[Optional[int]] = getattr(mmap, 'MADV_WILLNEED', None)
+_MADV_DONTNEED: Final[Optional[int]] = getattr(mmap, 'MADV_DONTNEED', None)
+
+
+def _index_lines(data: Any) -> 'array[int]':
+    """
+    Record the byte offset at which every line of `data` starts.
+
+    Newlines are located with the C-level `find` of the underlying buffer, so
+    no per-line objects are created while scanning.
+
+    Args:
+        data: A bytes-like object with a `find` method, or a memoryview of one
+
+    Returns:
+        array: Line start offsets, beginning with 0
+    """
+
+    if isinstance(data, memoryview):
+        data = data.obj
+
+    offsets = array('Q', [0])
+    append = offsets.append
+    find = data.find
+
+    pos = find(b'\n')
+    while pos >= 0:
+        pos += 1
+        append(pos)
+        pos = find(b'\n', pos)
+
+    return offsets
 
 
-@dataclass
 class UndoAction:
-    """Represents an undoable action in the buffer."""
-    position: int
-    old_data: bytes
-    new_data: bytes
-    action_type: str
-    batch_actions: List['UndoAction'] = field(default_factory=list)
+    """
+    Represents an undoable action in the buffer.
+
+    For code lines, 'replace_line' actions keep the old and new line strings
+    themselves, which are immutable and already in memory, so recording them
+    costs no copy. 'replace_line_delta' actions only store the replaced
+    fragment: `position` is the line index, `column` the character column of
+    the fragment, and `old_data`/`new_data` the removed and inserted text.
+
+    A 'replace_batch' action records many byte ranges replaced by the same
+    bytes: `spans` holds the start and end of every range in the original
+    data, `old_data` the replaced bytes of all ranges joined together, and
+    `new_data` the replacement.
+    """
+
+    __slots__ = ('position', 'old_data', 'new_data', 'action_type', 'batch_actions', 'column', 'spans')
+
+    def __init__(self, position: int, old_data: Union[bytes, str], new_data: Union[bytes, str],
+                 action_type: str, batch_actions: Optional[List['UndoAction']] = None,
+                 column: int = 0, spans: Optional['array[int]'] = None) -> None:
+        self.position = position
+        self.old_data = old_data
+        self.new_data = new_data
+        self.action_type = action_type
+        self.batch_actions: List['UndoAction'] = batch_actions if batch_actions is not None else []
+        self.column = column
+        self.spans = spans
+
+    def __repr__(self) -> str:
+        return (f"UndoAction(position={self.position!r}, old_data={self.old_data!r}, "
+                f"new_data={self.new_data!r}, action_type={self.action_type!r}, "
+                f"column={self.column!r})")
+
+
+def _action_size(action: UndoAction) -> int:
+    """Approximate memory held by an undo action: the length of its stored data."""
+
+    size = len(action.old_data) + len(action.new_data)
+    if action.spans is not None:
+        size += len(action.spans) * action.spans.itemsize
+
+    for batch_action in action.batch_actions:
+        size += _action_size(batch_action)
+
+    return size
+
+
+class UndoRing:
+    """
+    Fixed-capacity stack of undo actions stored in a preallocated ring.
+
+    Pushing onto a full ring overwrites the oldest action, like a bounded
+    deque, but without allocating or freeing storage blocks as it grows.
+    With `max_bytes` set, the oldest actions are also dropped while the data
+    they hold, measured when each action is pushed, exceeds that budget. The
+    most recent action is always kept.
+    """
+
+    __slots__ = ('_items', '_sizes', '_head', '_size', '_capacity', '_max_bytes', '_total_bytes')
+
+    def __init__(self, capacity: int, max_bytes: Optional[int] = None) -> None:
+        self._items: List[Optional[UndoAction]] = [None] * capacity
+        self._sizes: List[int] = [0] * capacity
+        self._head = 0
+        self._size = 0
+        self._capacity = capacity
+        self._max_bytes = max_bytes
+        self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[UndoAction]:
+        for index in range(self._size):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> UndoAction:
+        if index < 0:
+            index += self._size
+
+        if not 0 <= index < self._size:
+            raise IndexError("undo ring index out of range")
+
+        return self._items[(self._head - self._size + index) % self._capacity]
+
+    def append(self, action: UndoAction) -> None:
+        """Push an action, dropping the oldest ones if the ring is full or over budget."""
+
+        if self._size == self._capacity:
+            self._drop_oldest()
+
+        size = _action_size(action) if self._max_bytes is not None else 0
+        self._items[self._head] = action
+        self._sizes[self._head] = size
+        self._head = (self._head + 1) % self._capacity
+        self._size += 1
+        self._total_bytes += size
+
+        if self._max_bytes is not None:
+            while self._total_bytes > self._max_bytes and self._size > 1:
+                self._drop_oldest()
+
+    def _drop_oldest(self) -> None:
+        """Remove the least recently pushed action."""
+
+        tail = (self._head - self._size) % self._capacity
+        self._items[tail] = None
+        self._total_bytes -= self._sizes[tail]
+        self._sizes[tail] = 0
+        self._size -= 1
+
+    def pop(self) -> UndoAction:
+        """Remove and return the most recently pushed action."""
+
+        if not self._size:
+            raise IndexError("pop from an empty undo ring")
+
+        self._head = (self._head - 1) % self._capacity
+        action = self._items[self._head]
+        self._items[self._head] = None
+        self._total_bytes -= self._sizes[self._head]
+        self._sizes[self._head] = 0
+        self._size -= 1
+
+        return action
+
+    def clear(self) -> None:
+        """Remove all actions."""
+
+        if not self._size:
+            return
+
+        items = self._items
+        sizes = self._sizes
+        for _ in range(self._size):
+            self._head = (self._head - 1) % self._capacity
+            items[self._head] = None
+            sizes[self._head] = 0
+
+        self._head = 0
+        self._size = 0
+        self._total_bytes = 0
 
 
 class Buffer:
     """Main buffer class for handling hex data."""
 
     CHUNK_SIZE = 1024 * 1024
+    MAX_CACHED_CHUNKS = 5
+    UNDO_MERGE_WINDOW = 0.5
+    UNDO_LIMIT = 100
+    UNDO_MEMORY_LIMIT = 64 * 1024 * 1024
+    ASCII_TILE_SIZE = 64 * 1024
 
     def __init__(self, initial_data: bytes = b'') -> None:
         self.data = bytearray(initial_data)
+        self._data_version = 0
+        self._ascii_cache: Dict[bool, Tuple[Tuple[int, int, int], str]] = {}
+        self._ascii_tiles: Dict[bool, Dict[int, str]] = {False: {}, True: {}}
         self.modified = False
-        self.filename: Optional[str] = None
+        self._filename: Optional[str] = None
+        self._basename: Optional[str] = None
         self.cursor_pos = 0
-        self.undo_stack: deque[UndoAction] = deque(maxlen=100)
-        self.redo_stack: deque[UndoAction] = deque(maxlen=100)
+        self.undo_stack = UndoRing(self.UNDO_LIMIT, self.UNDO_MEMORY_LIMIT)
+        self.redo_stack = UndoRing(self.UNDO_LIMIT, self.UNDO_MEMORY_LIMIT)
+        self._pending_undo: Optional[UndoAction] = None
+        self._pending_undo_time = 0.0
         self.selection_start: Optional[int] = None
         self.selection_end: Optional[int] = None
         self.bytes_per_line = 16
 
         self.is_code_file = False
         self.language = None
-        self.code_lines: List[str] = []
+        self._code_lines = LineBuffer()
+        self._line_offsets: 'array[int]' = array('Q', [0])
+        self._line_offsets_source: Optional[LineBuffer] = None
+        self._line_offsets_version = -1
         self.line_count = 0
         self.top_line = 0
         self.cursor_line = 0
@@ -46,20 +249,128 @@ class Buffer:
         self.edit_mode = False
 
         self.file_size = 0
+        self._line_count_cache: Optional[int] = None
         self.file_map = None
+        self._mm_view: Optional[memoryview] = None
         self.is_large_file = False
-        self.loaded_chunks: Dict[int, bytearray] = {}
+        self.loaded_chunks: 'OrderedDict[int, memoryview]' = OrderedDict()
+        self.access_pattern = 'normal'
+        self._last_chunk_index = 0
+
+    @property
+    def filename(self) -> Optional[str]:
+        """Path of the file backing the buffer, if any."""
+
+        return self._filename
 
-    def get_line(self, line_number: int) -> Tuple[bytes, str]:
-        """Get a line of hex data and its ASCII representation."""
+    @filename.setter
+    def filename(self, filename: Optional[str]) -> None:
+        self._filename = filename
+        self._basename = os.path.basename(filename) if filename else None
+
+    @property
+    def basename(self) -> Optional[str]:
+        """Final component of the filename, computed once per assignment."""
+
+        return self._basename
+
+    @property
+    def code_lines(self) -> LineBuffer:
+        """Lines of a code file, kept in a gap buffer for cheap line edits."""
+
+        return self._code_lines
+
+    @code_lines.setter
+    def code_lines(self, lines: Iterable[str]) -> None:
+        if not isinstance(lines, LineBuffer):
+            lines = LineBuffer(lines)
+
+        self._code_lines = lines
+
+    def mark_data_changed(self, start: int = 0, end: Optional[int] = None) -> None:
+        """
+        Record a change of the raw data made by writing to `data` directly.
+
+        Args:
+            start: Offset of the first changed byte
+            end: Offset after the last changed byte, or None if everything
+                from `start` onwards moved, e.g. because the length changed
+        """
+
+        self._data_version += 1
+
+        tile_size = self.ASCII_TILE_SIZE
+        first = start // tile_size
+        for tiles in self._ascii_tiles.values():
+            if end is None:
+                for index in [index for index in tiles if index >= first]:
+                    del tiles[index]
+            else:
+                for index in range(first, (end - 1) // tile_size + 1):
+                    tiles.pop(index, None)
+
+    def get_ascii_text(self, lower: bool = False) -> str:
+        """
+        Get the ASCII representation of the whole buffer as searched by `SearchEngine`.
+
+        Non-printable bytes become '.'. The text is translated in tiles of
+        `ASCII_TILE_SIZE` bytes which are kept until `mark_data_changed`
+        reports a change inside them, so after an edit only the touched tiles
+        are translated again before the text is reassembled.
+
+        Args:
+            lower: Whether to return the text with letters lowercased
+
+        Returns:
+            str: One character per byte of the buffer
+        """
+
+        key = (self._data_version, id(self.data), len(self.data))
+        cached = self._ascii_cache.get(lower)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        data = self.data
+        table = _ASCII_LOWER_TABLE if lower else _ASCII_TABLE
+        tiles = self._ascii_tiles[lower]
+        tile_size = self.ASCII_TILE_SIZE
+
+        parts = []
+        for index in range((len(data) + tile_size - 1) // tile_size):
+            tile = tiles.get(index)
+            if tile is None:
+                start = index * tile_size
+                tile = data[start:start + tile_size].translate(table).decode('latin-1')
+                tiles[index] = tile
+            parts.append(tile)
+
+        text = ''.join(parts)
+        self._ascii_cache[lower] = (key, text)
+        return text
+
+    def get_line(self, line_number: int) -> Tuple[Any, bytes]:
+        """
+        Get a line of hex data and its ASCII representation.
+
+        For large files the hex data is a read-only memoryview into the mapped
+        file rather than a copy. The ASCII representation is returned as bytes
+        with non-printable bytes replaced by '.', ready to be drawn byte by byte.
+        """
 
         if self.is_large_file:
             chunk_index = (line_number * self.bytes_per_line) // self.CHUNK_SIZE
             chunk_offset = (line_number * self.bytes_per_line) % self.CHUNK_SIZE
 
-            if chunk_index not in self.loaded_chunks:
+            if chunk_index in self.loaded_chunks:
+                self.loaded_chunks.move_to_end(chunk_index)
+            else:
                 self._load_chunk(chunk_index)
 
+            if chunk_index != self._last_chunk_index:
+                step = 1 if chunk_index > self._last_chunk_index else -1
+                self._prefetch_chunk(chunk_index + step)
+                self._last_chunk_index = chunk_index
+
             chunk_data = self.loaded_chunks[chunk_index]
             start = chunk_offset
             end = min(start + self.bytes_per_line, len(chunk_data))
@@ -69,29 +380,155 @@ class Buffer:
             end = min(start + self.bytes_per_line, len(self.data))
             hex_data = self.data[start:end]
 
-        ascii_str = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in hex_data)
-
-        return hex_data, ascii_str
+        return hex_data, bytes(hex_data).translate(_ASCII_TABLE)
 
     def _load_chunk(self, chunk_index: int) -> None:
-        """Load a chunk of data from a large file."""
+        """Register a view of one chunk of a large file, without copying it."""
 
-        if not self.file_map:
+        if self._mm_view is None:
             return
 
-        start_pos = chunk_index * self.CHUNK_SIZE
+        start_pos = min(chunk_index * self.CHUNK_SIZE, self.file_size)
         end_pos = min(start_pos + self.CHUNK_SIZE, self.file_size)
 
-        if start_pos >= self.file_size:
-            self.loaded_chunks[chunk_index] = bytearray()
+        self.loaded_chunks[chunk_index] = self._mm_view[start_pos:end_pos]
+        self._madvise(_MADV_WILLNEED, start_pos, end_pos - start_pos)
+
+        if len(self.loaded_chunks) > self.MAX_CACHED_CHUNKS:
+            evicted_index, _ = self.loaded_chunks.popitem(last=False)
+            evicted_start = evicted_index * self.CHUNK_SIZE
+            self._madvise(_MADV_DONTNEED, evicted_start, self.CHUNK_SIZE)
+
+    def _prefetch_chunk(self, chunk_index: int) -> None:
+        """Ask the kernel to start reading a chunk the viewer is moving towards."""
+
+        if chunk_index < 0 or chunk_index in self.loaded_chunks:
+            return
+
+        self._madvise(_MADV_WILLNEED, chunk_index * self.CHUNK_SIZE, self.CHUNK_SIZE)
+
+    def _madvise(self, option: Optional[int], start: int = 0, length: Optional[int] = None) -> None:
+        """Pass a paging hint for the mapped file to the kernel, if supported."""
+
+        if option is None or not self.file_map or not hasattr(self.file_map, 'madvise'):
+            return
+
+        if start >= self.file_size:
+            return
+
+        try:
+            if length is None:
+                self.file_map.madvise(option)
+            else:
+                self.file_map.madvise(option, start, min(length, self.file_size - start))
+        except (OSError, ValueError):
+            pass
+
+    def set_access_pattern(self, pattern: str) -> None:
+        """
+        Tell the kernel how a large file is about to be read.
+
+        Args:
+            pattern: One of 'normal', 'sequential' (paging/scrolling) or
+                'random' (jumping to distant offsets)
+        """
+
+        if pattern == self.access_pattern or pattern not in _MADVISE_OPTIONS:
             return
 
-        self.loaded_chunks[chunk_index] = bytearray(self.file_map[start_pos:end_pos])
+        self.access_pattern = pattern
+        self._madvise(_MADVISE_OPTIONS[pattern])
+
+    def get_line_offsets(self) -> 'array[int]':
+        """
+        Get the UTF-8 byte offset at which every code line starts.
+
+        The offsets count one byte for each line separator, matching the
+        positions reported by searches over the code text. They are kept in
+        a compact `array`, eight bytes per line, and cached until `code_lines`
+        is modified or replaced; after an edit only the offsets from the first
+        modified line onwards are recomputed.
+
+        Returns:
+            array: Line start offsets followed by the total length
+        """
+
+        lines = self._code_lines
+        if self._line_offsets_source is lines:
+            if self._line_offsets_version == lines.version:
+                return self._line_offsets
+
+            offsets = self._line_offsets
+            start = min(lines.dirty_from or 0, len(offsets) - 1)
+            del offsets[start + 1:]
+        else:
+            offsets = array('Q', [0])
+            start = 0
+
+        append = offsets.append
+        total = offsets[start]
+        for line in lines.iter_from(start):
+            total += utf8_length(line) + 1
+            append(total)
 
-        if len(self.loaded_chunks) > 5:
-            oldest_chunk = min(self.loaded_chunks.keys())
-            if oldest_chunk != chunk_index:
-                del self.loaded_chunks[oldest_chunk]
+        lines.clear_dirty()
+        self._line_offsets = offsets
+        self._line_offsets_source = lines
+        self._line_offsets_version = lines.version
+
+        return offsets
+
+    def locate_code_position(self, position: int) -> Optional[Tuple[int, int]]:
+        """
+        Find the code line containing a byte position of the code text.
+
+        Args:
+            position: Byte offset into the code text
+
+        Returns:
+            tuple: (line index, byte offset of the line start), or None if the
+                position lies outside the text
+        """
+
+        offsets = self.get_line_offsets()
+        if position < 0 or position >= offsets[-1]:
+            return None
+
+        line_index = bisect_right(offsets, position) - 1
+
+        return line_index, offsets[line_index]
+
+    def locate_code_positions(self, positions: List[int]) -> List[Optional[Tuple[int, int]]]:
+        """
+        Find the code lines containing several byte positions at once.
+
+        Search results arrive in ascending order, so each lookup only bisects
+        the offsets from the line of the previous position onwards.
+
+        Args:
+            positions: Byte offsets into the code text
+
+        Returns:
+            list: A `locate_code_position` result for every position, in order
+        """
+
+        offsets = self.get_line_offsets()
+        total = offsets[-1]
+        located: List[Optional[Tuple[int, int]]] = []
+        append = located.append
+        line_index = 0
+        previous = 0
+
+        for position in positions:
+            if 0 <= position < total:
+                low = line_index if position >= previous else 0
+                line_index = bisect_right(offsets, position, low) - 1
+                previous = position
+                append((line_index, offsets[line_index]))
+            else:
+                append(None)
+
+        return located
 
     def get_code_line(self, line_number: int) -> str:
         """Get a line of code text."""
@@ -107,7 +544,10 @@ class Buffer:
         hex_width = width - 10
         max_bytes = (hex_width - 2) // 3
 
-        self.bytes_per_line = max(8, (max_bytes // 8) * 8)
+        bytes_per_line = max(8, (max_bytes // 8) * 8)
+        if bytes_per_line != self.bytes_per_line:
+            self.bytes_per_line = bytes_per_line
+            self._line_count_cache = None
 
     def get_line_count(self) -> int:
         """Get the total number of lines based on current bytes_per_line."""
@@ -115,7 +555,10 @@ class Buffer:
         if self.is_code_file:
             return len(self.code_lines)
         elif self.is_large_file:
-            return (self.file_size + self.bytes_per_line - 1) // self.bytes_per_line
+            if self._line_count_cache is None:
+                self._line_count_cache = (self.file_size + self.bytes_per_line - 1) // self.bytes_per_line
+
+            return self._line_count_cache
 
         return (len(self.data) + self.bytes_per_line - 1) // self.bytes_per_line
 
@@ -142,12 +585,11 @@ class Buffer:
             raise ValueError("Byte value must be between 0 and 255")
             
         position = max(0, min(position, len(self.data)))
-            
-        action = UndoAction(position, b'', bytes([value]), 'insert')
-        self.undo_stack.append(action)
-        self.redo_stack.clear()
-        
+
+        self._record_byte_edit(position, b'', _BYTE_VALUES[value], 'insert')
+
         self.data.insert(position, value)
+        self.mark_data_changed(position)
         self.modified = True
 
     def delete_byte(self, position: int) -> None:
@@ -157,16 +599,124 @@ class Buffer:
             return
 
         old_value = self.data[position]
-        action = UndoAction(position, bytes([old_value]), b'', 'delete')
-        self.undo_stack.append(action)
-        self.redo_stack.clear()
-            
+        self._record_byte_edit(position, _BYTE_VALUES[old_value], b'', 'delete')
+
         del self.data[position]
+        self.mark_data_changed(position)
         self.modified = True
         
         if self.cursor_pos >= len(self.data):
             self.cursor_pos = max(0, len(self.data) - 1)
 
+    def replace_ranges(self, spans: Iterable[Tuple[int, int]], replacement: bytes) -> Optional[UndoAction]:
+        """
+        Replace byte ranges with the same bytes in a single pass over the data.
+
+        The edit is recorded in one 'replace_batch' action, which is returned
+        instead of pushed, so callers can group it with other actions.
+
+        Args:
+            spans: Sorted, non-overlapping (start, end) ranges
+            replacement: The bytes to put in place of every range
+
+        Returns:
+            The undo action, or None if there was nothing to replace
+        """
+
+        flat = array('Q')
+        old_parts = []
+
+        with memoryview(self.data) as view:
+            for start, end in spans:
+                flat.append(start)
+                flat.append(end)
+                old_parts.append(view[start:end])
+
+            old_data = b''.join(old_parts)
+            old_parts.clear()
+
+        if not flat:
+            return None
+
+        action = UndoAction(flat[0], old_data, replacement, 'replace_batch', spans=flat)
+        self._apply_replace_batch(action, undo=False)
+        self.modified = True
+
+        return action
+
+    def _apply_replace_batch(self, action: UndoAction, undo: bool) -> None:
+        """Apply a 'replace_batch' action to the data, or revert it."""
+
+        spans = action.spans
+        new_data = action.new_data
+        new_length = len(new_data)
+
+        with memoryview(self.data) as view, memoryview(action.old_data) as old_view:
+            if all(spans[i + 1] - spans[i] == new_length for i in range(0, len(spans), 2)):
+                # Ranges keep their length, so they are overwritten in place
+                old_offset = 0
+                for i in range(0, len(spans), 2):
+                    start = spans[i]
+                    if undo:
+                        view[start:start + new_length] = old_view[old_offset:old_offset + new_length]
+                    else:
+                        view[start:start + new_length] = new_data
+                    old_offset += new_length
+
+                self.mark_data_changed(spans[0], spans[-1])
+                return
+
+            parts = []
+            cursor = 0
+            shift = 0
+            old_offset = 0
+
+            for i in range(0, len(spans), 2):
+                start = spans[i]
+                old_length = spans[i + 1] - start
+
+                if undo:
+                    start += shift
+                    parts.append(view[cursor:start])
+                    parts.append(old_view[old_offset:old_offset + old_length])
+                    cursor = start + new_length
+                else:
+                    parts.append(view[cursor:start])
+                    parts.append(new_data)
+                    cursor = start + old_length
+
+                shift += new_length - old_length
+                old_offset += old_length
+
+            parts.append(view[cursor:])
+            data = bytearray().join(parts)
+            parts.clear()
+
+        self.data = data
+        self.mark_data_changed(spans[0])
+
+    def delete_range(self, start: int, end: int) -> None:
+        """Delete the bytes in [start, end) as a single undo step."""
+
+        start = max(0, start)
+        end = min(end, len(self.data))
+        if start >= end:
+            return
+
+        with memoryview(self.data) as view:
+            old_data = view[start:end].tobytes()
+
+        self.end_undo_group()
+        self.undo_stack.append(UndoAction(start, old_data, b'', 'delete'))
+        self.redo_stack.clear()
+
+        del self.data[start:end]
+        self.mark_data_changed(start)
+        self.modified = True
+
+        if self.cursor_pos >= len(self.data):
+            self.cursor_pos = max(0, len(self.data) - 1)
+
     def replace_byte(self, position: int, value: int) -> None:
         """Replace a byte at the specified position."""
 
@@ -181,13 +731,66 @@ class Buffer:
         if old_value == value:
             return
 
-        action = UndoAction(position, bytes([old_value]), bytes([value]), 'replace')
-        self.undo_stack.append(action)
-        self.redo_stack.clear()
+        self._record_byte_edit(position, _BYTE_VALUES[old_value], _BYTE_VALUES[value], 'replace')
 
         self.data[position] = value
+        self.mark_data_changed(position, position + 1)
         self.modified = True
 
+    def _record_byte_edit(self, position: int, old_data: bytes, new_data: bytes, action_type: str) -> None:
+        """
+        Record a single-byte edit, merging it into the pending undo action if possible.
+
+        Edits of the same type that continue the previous one (typing forward,
+        overwriting forward, deleting forward or backspacing) within
+        `UNDO_MERGE_WINDOW` seconds extend that action instead of pushing a new
+        one, so a burst of keystrokes becomes a single undo step.
+
+        Args:
+            position: Position of the edited byte
+            old_data: The byte that was removed or overwritten
+            new_data: The byte that was inserted or written
+            action_type: One of 'insert', 'delete' or 'replace'
+        """
+
+        now = time.monotonic()
+        pending = self._pending_undo
+
+        if (pending is not None and pending.action_type == action_type
+                and now - self._pending_undo_time <= self.UNDO_MERGE_WINDOW
+                and self.undo_stack and self.undo_stack[-1] is pending):
+            end = pending.position + len(pending.new_data)
+            merged = True
+
+            if action_type == 'insert' and position == end:
+                pending.new_data += new_data
+            elif action_type == 'replace' and position == end:
+                pending.old_data += old_data
+                pending.new_data += new_data
+            elif action_type == 'delete' and position == pending.position:
+                pending.old_data += old_data
+            elif action_type == 'delete' and position == pending.position - 1:
+                pending.old_data = old_data + pending.old_data
+                pending.position = position
+            else:
+                merged = False
+
+            if merged:
+                self._pending_undo_time = now
+                return
+
+        action = UndoAction(position, old_data, new_data, action_type)
+        self.undo_stack.append(action)
+        self.redo_stack.clear()
+
+        self._pending_undo = action
+        self._pending_undo_time = now
+
+    def end_undo_group(self) -> None:
+        """Stop merging further byte edits into the last undo action."""
+
+        self._pending_undo = None
+
     def insert_text(self, line: int, column: int, text: str) -> None:
         """Insert text at the specified position in code view."""
 
@@ -197,7 +800,7 @@ class Buffer:
         current_line = self.code_lines[line]
         column = min(column, len(current_line))
 
-        new_line = current_line[:column] + text + current_line[column:]
+        new_line = ''.join((current_line[:column], text, current_line[column:]))
         self.code_lines[line] = new_line
 
         self.cursor_column = column + len(text)
@@ -243,6 +846,34 @@ class Buffer:
         self.modified = True
         self.redo_stack.clear()
 
+    def split_line(self, line: int, column: int) -> None:
+        """Split a line in code view at `column` and move the cursor to the new line."""
+
+        if not self.is_code_file or line >= len(self.code_lines):
+            return
+
+        current_line = self.code_lines[line]
+        self.code_lines[line] = current_line[:column]
+        self.code_lines.insert(line + 1, current_line[column:])
+
+        self.cursor_line = line + 1
+        self.cursor_column = 0
+
+        self.modified = True
+        self.redo_stack.clear()
+
+    def join_lines(self, line: int) -> None:
+        """Append the line following `line` to it in code view."""
+
+        if not self.is_code_file or line + 1 >= len(self.code_lines):
+            return
+
+        self.code_lines[line] = self.code_lines[line] + self.code_lines[line + 1]
+        del self.code_lines[line + 1]
+
+        self.modified = True
+        self.redo_stack.clear()
+
     def delete_line(self, line: int) -> None:
         """Delete a line in code view."""
 
@@ -259,14 +890,33 @@ class Buffer:
         self.modified = True
         self.redo_stack.clear()
 
+    def _splice_line(self, line_num: int, column: int, removed: str, inserted: str) -> bool:
+        """
+        Swap the fragment `removed` at `column` of a code line for `inserted`.
+
+        Returns:
+            bool: True if the line exists and was changed
+        """
+
+        if not 0 <= line_num < len(self.code_lines):
+            return False
+
+        line = self.code_lines[line_num]
+        self.code_lines[line_num] = ''.join((line[:column], inserted, line[column + len(removed):]))
+
+        return True
+
     def undo(self) -> bool:
         """Undo the last action."""
 
+        self.end_undo_group()
+
         if not self.undo_stack:
             return False
 
         action = self.undo_stack.pop()
         self.redo_stack.append(action)
+        self.mark_data_changed()
 
         if action.action_type == 'batch_replace':
             for batch_action in reversed(action.batch_actions):
@@ -275,19 +925,26 @@ class Buffer:
                     end = start + len(batch_action.new_data)
                     self.data[start:end] = batch_action.old_data
 
+                elif batch_action.action_type == 'replace_batch':
+                    self._apply_replace_batch(batch_action, undo=True)
+
                 elif batch_action.action_type == 'replace_line' and self.is_code_file:
                     line_num = batch_action.position
                     if 0 <= line_num < len(self.code_lines):
-                        self.code_lines[line_num] = batch_action.old_data.decode('utf-8', errors='replace')
+                        self.code_lines[line_num] = batch_action.old_data
+
+                elif batch_action.action_type == 'replace_line_delta' and self.is_code_file:
+                    self._splice_line(batch_action.position, batch_action.column,
+                                      batch_action.new_data, batch_action.old_data)
 
         elif action.action_type == 'insert':
-            del self.data[action.position]
+            del self.data[action.position:action.position + len(action.new_data)]
 
         elif action.action_type == 'delete':
-            self.data.insert(action.position, action.old_data[0])
+            self.data[action.position:action.position] = action.old_data
 
         elif action.action_type == 'replace':
-            self.data[action.position] = action.old_data[0]
+            self.data[action.position:action.position + len(action.new_data)] = action.old_data
 
         elif action.action_type == 'replace_range':
             start = action.position
@@ -295,13 +952,22 @@ class Buffer:
             self.data[start:end] = action.old_data
             self.cursor_pos = start
 
+        elif action.action_type == 'replace_batch':
+            self._apply_replace_batch(action, undo=True)
+            self.cursor_pos = action.position
+
         elif action.action_type == 'replace_line' and self.is_code_file:
             line_num = action.position
             if 0 <= line_num < len(self.code_lines):
-                self.code_lines[line_num] = action.old_data.decode('utf-8', errors='replace')
+                self.code_lines[line_num] = action.old_data
                 self.cursor_line = line_num
                 self.cursor_column = 0
 
+        elif action.action_type == 'replace_line_delta' and self.is_code_file:
+            if self._splice_line(action.position, action.column, action.new_data, action.old_data):
+                self.cursor_line = action.position
+                self.cursor_column = action.column
+
         self.modified = bool(self.undo_stack)
 
         if not self.is_code_file and self.cursor_pos >= len(self.data):
@@ -311,11 +977,14 @@ class Buffer:
 
     def redo(self) -> bool:
         """Redo the last undone action."""
+        self.end_undo_group()
+
         if not self.redo_stack:
             return False
 
         action = self.redo_stack.pop()
         self.undo_stack.append(action)
+        self.mark_data_changed()
 
         if action.action_type == 'batch_replace':
             for batch_action in action.batch_actions:
@@ -323,19 +992,24 @@ class Buffer:
                     start = batch_action.position
                     end = start + len(batch_action.old_data)
                     self.data[start:end] = batch_action.new_data
+                elif batch_action.action_type == 'replace_batch':
+                    self._apply_replace_batch(batch_action, undo=False)
                 elif batch_action.action_type == 'replace_line' and self.is_code_file:
                     line_num = batch_action.position
                     if 0 <= line_num < len(self.code_lines):
-                        self.code_lines[line_num] = batch_action.new_data.decode('utf-8', errors='replace')
+                        self.code_lines[line_num] = batch_action.new_data
+                elif batch_action.action_type == 'replace_line_delta' and self.is_code_file:
+                    self._splice_line(batch_action.position, batch_action.column,
+                                      batch_action.old_data, batch_action.new_data)
 
         elif action.action_type == 'insert':
-            self.data.insert(action.position, action.new_data[0])
+            self.data[action.position:action.position] = action.new_data
 
         elif action.action_type == 'delete':
-            del self.data[action.position]
+            del self.data[action.position:action.position + len(action.old_data)]
 
         elif action.action_type == 'replace':
-            self.data[action.position] = action.new_data[0]
+            self.data[action.position:action.position + len(action.old_data)] = action.new_data
 
         elif action.action_type == 'replace_range':
             start = action.position
@@ -343,13 +1017,22 @@ class Buffer:
             self.data[start:end] = action.new_data
             self.cursor_pos = start + len(action.new_data)
 
+        elif action.action_type == 'replace_batch':
+            self._apply_replace_batch(action, undo=False)
+            self.cursor_pos = action.position + len(action.new_data)
+
         elif action.action_type == 'replace_line' and self.is_code_file:
             line_num = action.position
             if 0 <= line_num < len(self.code_lines):
-                self.code_lines[line_num] = action.new_data.decode('utf-8', errors='replace')
+                self.code_lines[line_num] = action.new_data
                 self.cursor_line = line_num
                 self.cursor_column = 0
 
+        elif action.action_type == 'replace_line_delta' and self.is_code_file:
+            if self._splice_line(action.position, action.column, action.old_data, action.new_data):
+                self.cursor_line = action.position
+                self.cursor_column = action.column + len(action.new_data)
+
         self.modified = True
 
         if not self.is_code_file and self.cursor_pos >= len(self.data):
@@ -378,7 +1061,7 @@ class Buffer:
         """Check if a file is binary based on a sample of its content."""
 
         null_count = sample.count(0)
-        printable_count = sum(32 <= b <= 126 or b in (9, 10, 13) for b in sample)
+        printable_count = len(sample) - sample.translate(_PRINTABLE_MARK).count(1)
 
         return (null_count > len(sample) * 0.1) or (printable_count < len(sample) * 0.8)
 
@@ -390,9 +1073,11 @@ class Buffer:
         self.cursor_pos = 0
         self.undo_stack.clear()
         self.redo_stack.clear()
+        self.end_undo_group()
 
         file_size = os.path.getsize(filename)
         self.file_size = file_size
+        self._line_count_cache = None
 
         if file_size > 10 * 1024 * 1024:
             self.is_large_file = True
@@ -402,8 +1087,11 @@ class Buffer:
         self.is_large_file = False
         with open(filename, 'rb') as f:
             self.data = bytearray(f.read())
+        self.mark_data_changed()
+
+        with memoryview(self.data) as view:
+            sample = view[:4096].tobytes()
 
-        sample = bytes(self.data[:min(4096, len(self.data))])
         self._detect_file_type(sample)
 
     def _load_large_file(self, filename: str) -> None:
@@ -411,6 +1099,9 @@ class Buffer:
 
         self.file = open(filename, 'rb')
         self.file_map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mm_view = memoryview(self.file_map)
+        self._last_chunk_index = 0
+        self.set_access_pattern('sequential')
         self._load_chunk(0)
 
         sample = bytes(self.loaded_chunks[0][:min(4096, len(self.loaded_chunks[0]))])
@@ -442,40 +1133,17 @@ class Buffer:
             self.edit_mode = True
 
             if self.is_large_file:
-                self._load_text_chunk(0)
-                return 
+                self.code_lines = MappedLines(self.file_map, _index_lines(self._mm_view))
+                return
 
-            text_content = self.data.decode('utf-8', errors='replace')
-            self.code_lines = text_content.splitlines()
+            text_content = bytes(self.data)
+            self.code_lines = MappedLines(text_content, _index_lines(text_content))
 
         except Exception:
             self.is_code_file = False
             self.language = None
             self.code_lines = []
             
-    def _load_text_chunk(self, chunk_index: int) -> None:
-        """Load a chunk of text for code view."""
-
-        if not self.file_map:
-            return
-
-        start_pos = chunk_index * self.CHUNK_SIZE
-        end_pos = min(start_pos + self.CHUNK_SIZE, self.file_size)
-
-        if start_pos >= self.file_size:
-            return
-
-        chunk_data = self.file_map[start_pos:end_pos]
-        text_chunk = chunk_data.decode('utf-8', errors='replace')
-
-        lines = text_chunk.splitlines()
-
-        if chunk_index == 0:
-            self.code_lines = lines
-            return
-
-        self.code_lines.extend(lines)
-
     def save_file(self, filename: Optional[str] = None) -> bool:
         """
         Save data to a file.
@@ -491,17 +1159,23 @@ class Buffer:
         if not save_filename:
             return False
 
+        self.end_undo_group()
+
         try:
             if self.is_code_file:
-                with open(save_filename, 'w', encoding='utf-8') as f:
-                    f.write('\n'.join(self.code_lines))
+                lines = self.code_lines
+                lines.materialize()
+                with open(save_filename, 'w', encoding='utf-8', buffering=65536) as f:
+                    if lines:
+                        last = len(lines) - 1
+                        f.writelines(line + '\n' for line in islice(lines, last))
+                        f.write(lines[last])
             else:
                 with open(save_filename, 'wb') as f:
                     if self.is_large_file and self.file_map:
-                        self.file_map.seek(0)
-                        f.write(self.file_map)
+                        self._write_mapped_file(f)
                     else:
-                        f.write(bytes(self.data))
+                        f.write(self.data)
 
             self.filename = save_filename
             self.modified = False
@@ -509,17 +1183,43 @@ class Buffer:
         except Exception as e:
             raise IOError(f"Failed to save file: {str(e)}")
             
+    def _write_mapped_file(self, f: Any) -> None:
+        """Copy the memory-mapped file into `f` without a full-size intermediate copy."""
+
+        offset = 0
+
+        if hasattr(os, 'sendfile') and self.file:
+            try:
+                while offset < self.file_size:
+                    sent = os.sendfile(f.fileno(), self.file.fileno(), offset, self.file_size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            except OSError:
+                pass
+
+        if offset >= self.file_size:
+            return
+
+        view = self._mm_view
+        for start in range(offset, self.file_size, self.CHUNK_SIZE):
+            f.write(view[start:start + self.CHUNK_SIZE])
+
     def close(self) -> None:
         """Close the buffer and release resources."""
 
         if not self.is_large_file or not self.file_map:
             return
 
+        self.loaded_chunks.clear()
+
+        if self._mm_view is not None:
+            self._mm_view.release()
+            self._mm_view = None
+
         self.file_map.close()
         self.file_map = None
 
-        self.loaded_chunks.clear()
-
         if not self.file:
             return
 
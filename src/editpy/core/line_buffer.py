@@ -0,0 +1,267 @@
+"""
+Line storage module for code buffers.
+"""
+
+import functools
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional, Union
+
+
+@functools.lru_cache(maxsize=4096)
+def _encoded_length(line: str) -> int:
+    """UTF-8 length of a non-ASCII line, remembered while the line is unchanged."""
+
+    return len(line.encode('utf-8'))
+
+
+def utf8_length(line: str) -> int:
+    """
+    Get the UTF-8 encoded length of a line without encoding it if possible.
+
+    ASCII-only strings, the common case for source code, encode to one byte
+    per character; `str.isascii` reads a flag CPython already stores on the
+    string, so no bytes object is created for them. Lengths of other lines
+    are memoized, so rebuilding line offsets after an edit only encodes the
+    lines that actually changed.
+    """
+
+    if line.isascii():
+        return len(line)
+
+    return _encoded_length(line)
+
+
+class MappedLines:
+    """
+    Read-only sequence of lines decoded on demand from a byte buffer.
+
+    Only the byte offset of each line start is kept, so a large file costs
+    eight bytes per line until a line is actually requested.
+    """
+
+    __slots__ = ('_data', '_offsets', '_count')
+
+    def __init__(self, data: Any, offsets: Any) -> None:
+        self._data = data
+        self._offsets = offsets
+
+        count = len(offsets)
+        if offsets[-1] >= len(data):
+            count -= 1
+
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self[index]
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+
+        if index < 0:
+            index += self._count
+
+        if not 0 <= index < self._count:
+            raise IndexError("line index out of range")
+
+        offsets = self._offsets
+        start = offsets[index]
+        end = offsets[index + 1] - 1 if index + 1 < len(offsets) else len(self._data)
+
+        line = self._data[start:end]
+        if line.endswith(b'\r'):
+            line = line[:-1]
+
+        return line.decode('utf-8', errors='replace')
+
+
+class LineBuffer:
+    """
+    Gap buffer of text lines with a list-like interface.
+
+    Lines before the gap are kept in order, lines after the gap are kept in
+    reverse order, so inserting or deleting lines near the previous edit only
+    moves the lines between the old and the new gap position instead of
+    shifting the whole tail of the file.
+
+    When created from a `MappedLines` sequence, reads are served from it
+    directly and the lines are only materialized on the first modification.
+
+    `version` is bumped by every modification, so derived data such as line
+    byte offsets can be cached and cheaply checked for staleness. The lowest
+    modified index is tracked in `dirty_from`, so such data only has to be
+    recomputed from the first changed line onwards.
+    """
+
+    __slots__ = ('_before', '_after', '_source', '_version', '_dirty_from')
+
+    def __init__(self, lines: Iterable[str] = ()) -> None:
+        self._source: Optional[MappedLines] = None
+        self._after: List[str] = []
+        self._version = 0
+        self._dirty_from: Optional[int] = None
+
+        if isinstance(lines, MappedLines):
+            self._source = lines
+            self._before: List[str] = []
+        else:
+            self._before = list(lines)
+
+    @property
+    def version(self) -> int:
+        """Modification counter of the buffer."""
+
+        return self._version
+
+    @property
+    def dirty_from(self) -> Optional[int]:
+        """Lowest line index modified since the last `clear_dirty` call."""
+
+        return self._dirty_from
+
+    def clear_dirty(self) -> None:
+        """Forget the modified range once derived data has caught up."""
+
+        self._dirty_from = None
+
+    def _mark_dirty(self, index: int) -> None:
+        """Record a modification at or after `index`."""
+
+        self._version += 1
+        if self._dirty_from is None or index < self._dirty_from:
+            self._dirty_from = index
+
+    def materialize(self) -> None:
+        """Decode every line of a lazily backed buffer into memory."""
+
+        if self._source is None:
+            return
+
+        self._before = list(self._source)
+        self._source = None
+
+    def _move_gap(self, index: int) -> None:
+        """Move the gap so that exactly `index` lines precede it."""
+
+        before = self._before
+        after = self._after
+        gap = len(before)
+
+        if index < gap:
+            moved = before[index:]
+            del before[index:]
+            moved.reverse()
+            after.extend(moved)
+        elif index > gap:
+            count = index - gap
+            moved = after[-count:]
+            del after[-count:]
+            moved.reverse()
+            before.extend(moved)
+
+    def _check_index(self, index: int) -> int:
+        """Normalize a possibly negative index and validate its range."""
+
+        length = len(self._before) + len(self._after)
+        if index < 0:
+            index += length
+
+        if not 0 <= index < length:
+            raise IndexError("line index out of range")
+
+        return index
+
+    def __len__(self) -> int:
+        if self._source is not None:
+            return len(self._source)
+
+        return len(self._before) + len(self._after)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._source is not None:
+            yield from self._source
+            return
+
+        yield from self._before
+        yield from reversed(self._after)
+
+    def iter_from(self, start: int) -> Iterator[str]:
+        """Iterate over the lines from index `start` to the end."""
+
+        if self._source is not None:
+            source = self._source
+            for index in range(start, len(source)):
+                yield source[index]
+            return
+
+        before = self._before
+        if start < len(before):
+            yield from islice(before, start, None)
+            start = len(before)
+
+        yield from islice(reversed(self._after), start - len(before), None)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if self._source is not None:
+            return self._source[index]
+
+        index = self._check_index(index)
+        before = self._before
+        if index < len(before):
+            return before[index]
+
+        return self._after[len(before) + len(self._after) - 1 - index]
+
+    def __setitem__(self, index: int, line: str) -> None:
+        self.materialize()
+        index = self._check_index(index)
+        self._mark_dirty(index)
+        before = self._before
+        if index < len(before):
+            before[index] = line
+            return
+
+        self._after[len(before) + len(self._after) - 1 - index] = line
+
+    def __delitem__(self, index: int) -> None:
+        self.materialize()
+        index = self._check_index(index)
+        self._mark_dirty(index)
+        self._move_gap(index)
+        self._after.pop()
+
+    def __repr__(self) -> str:
+        return f"LineBuffer({list(self)!r})"
+
+    def insert(self, index: int, line: str) -> None:
+        """Insert a line before `index`, clamping like `list.insert`."""
+
+        self.materialize()
+        length = len(self)
+        if index < 0:
+            index = max(0, index + length)
+
+        index = min(index, length)
+        self._mark_dirty(index)
+        self._move_gap(index)
+        self._before.append(line)
+
+    def append(self, line: str) -> None:
+        """Append a line at the end of the buffer."""
+
+        self.insert(len(self), line)
+
+    def extend(self, lines: Iterable[str]) -> None:
+        """Append several lines at the end of the buffer."""
+
+        self.materialize()
+        self._mark_dirty(len(self))
+        self._move_gap(len(self))
+        self._before.extend(lines)
@@ -4,62 +4,141 @@ Syntax highlighting module for the editor using Pygments.
 
 import re
 import curses
+import functools
+import importlib
+import os
 from typing import List, Tuple, Dict, Optional, Any, Final
-from pygments.lexers import get_lexer_for_filename
-from pygments.lexers.python import PythonLexer
-from pygments.lexers.javascript import JavascriptLexer
-from pygments.lexers.html import HtmlLexer
-from pygments.lexers.css import CssLexer
-from pygments.lexers.c_cpp import CLexer, CppLexer
-from pygments.lexers.jvm import JavaLexer
-from pygments.lexers.perl import PerlLexer
-from pygments.lexers.php import PhpLexer
-from pygments.lexers.ruby import RubyLexer
-from pygments.lexers.shell import BashLexer
-from pygments.lexers.rust import RustLexer
-from pygments.lexers.dotnet import CSharpLexer
+from pygments.lexers import find_lexer_class_for_filename, get_lexer_for_filename
 from pygments.token import Token
 from pygments.util import ClassNotFound
 
+# Color pairs 1-10 are used by the window manager for the UI
 SYNTAX_COLORS: Final[Dict[str, int]] = {
-    'keyword': 1,      # Cyan
-    'string': 2,       # Yellow
-    'comment': 3,      # Green
-    'function': 4,     # Cyan
-    'class': 5,        # Magenta
-    'number': 6,       # Red
-    'operator': 7,     # White
-    'variable': 8,     # Blue
+    'keyword': 11,     # Cyan
+    'string': 12,      # Yellow
+    'comment': 13,     # Green
+    'function': 14,    # Cyan
+    'class': 15,       # Magenta
+    'number': 16,      # Red
+    'operator': 17,    # White
+    'variable': 18,    # Blue
     'default': 0,      # Default
 }
 
 C_PATTERN: Final[str] = r'^\s*(#include|int\s+main|void\s+main|struct\s+\w+\s*{)'
 CPP_PATTERN: Final[str] = r'^\s*(class\s+\w+|namespace\s+\w+|template\s*<)'
 
-LANGUAGE_PATTERNS: Final[Dict[str, Tuple[Any, str]]] = {
+# Lexers are named as 'module:ClassName' and only imported once they are needed.
+C_LEXER: Final[str] = 'pygments.lexers.c_cpp:CLexer'
+CPP_LEXER: Final[str] = 'pygments.lexers.c_cpp:CppLexer'
+
+LANGUAGE_PATTERNS: Final[Dict[str, Tuple[str, str]]] = {
     r'^\s*(def|class|import|from|if __name__ == [\'"]__main__[\'"])': 
-        (PythonLexer(), 'Python'),
+        ('pygments.lexers.python:PythonLexer', 'Python'),
     r'^\s*(function|const|let|var|document\.|window\.|=>)':
-        (JavascriptLexer(), 'JavaScript'), 
+        ('pygments.lexers.javascript:JavascriptLexer', 'JavaScript'), 
     r'<html|<!DOCTYPE html|<body|<script|<div':
-        (HtmlLexer(), 'HTML'),
+        ('pygments.lexers.html:HtmlLexer', 'HTML'),
     r'^\s*(\.|#|@media|body\s*{|html\s*{)':
-        (CssLexer(), 'CSS'),
+        ('pygments.lexers.css:CssLexer', 'CSS'),
     r'^\s*(package|import\s+java|public\s+class)':
-        (JavaLexer(), 'Java'),
+        ('pygments.lexers.jvm:JavaLexer', 'Java'),
     r'^\s*(module|use\s+strict|package)':
-        (PerlLexer(), 'Perl'),
+        ('pygments.lexers.perl:PerlLexer', 'Perl'),
     r'^\s*(<?php|namespace|use\s+[\w\\]+;)':
-        (PhpLexer(), 'PHP'),
+        ('pygments.lexers.php:PhpLexer', 'PHP'),
     r'^\s*(require|module|def\s+\w+\s*\(|class\s+\w+\s*<)':
-        (RubyLexer(), 'Ruby'),
+        ('pygments.lexers.ruby:RubyLexer', 'Ruby'),
     r'^\s*(#!\s*/bin/bash|function\s+\w+\s*\(\))':
-        (BashLexer(), 'Bash'),
+        ('pygments.lexers.shell:BashLexer', 'Bash'),
     r'^\s*(module|fn\s+\w+|pub\s+struct)':
-        (RustLexer(), 'Rust'),
+        ('pygments.lexers.rust:RustLexer', 'Rust'),
     r'^\s*(using\s+System|namespace\s+\w+|public\s+class)':
-        (CSharpLexer(), 'C#'),
+        ('pygments.lexers.dotnet:CSharpLexer', 'C#'),
+}
+
+
+_LEXER_CACHE: Dict[str, Any] = {}
+
+
+def _get_lexer(lexer_path: str) -> Any:
+    """
+    Get a shared lexer instance, importing and creating it on first use.
+
+    Args:
+        lexer_path: The lexer as 'module:ClassName', e.g. 'pygments.lexers.python:PythonLexer'
+
+    Returns:
+        The lexer instance
+    """
+
+    lexer = _LEXER_CACHE.get(lexer_path)
+    if lexer is None:
+        module_name, class_name = lexer_path.split(':')
+        lexer_class = getattr(importlib.import_module(module_name), class_name)
+        lexer = _LEXER_CACHE[lexer_path] = lexer_class()
+
+    return lexer
+
+
+@functools.lru_cache(maxsize=256)
+def _language_for_filename(basename: str) -> Optional[str]:
+    """Name of the language Pygments associates with a file name, without creating a lexer."""
+
+    lexer_class = find_lexer_class_for_filename(basename)
+    return lexer_class.name if lexer_class else None
+
+
+@functools.lru_cache(maxsize=1024)
+def _tokenize_line(lexer: Any, line: str) -> Tuple[Tuple[Any, str], ...]:
+    """Tokenize a single line, memoized per (lexer, line) across redraws."""
+
+    return tuple(lexer.get_tokens(line))
+
+
+@functools.lru_cache(maxsize=32)
+def _tokenize_region(lexer: Any, text: str) -> Tuple[Tuple[Tuple[Any, str], ...], ...]:
+    """
+    Tokenize several newline-joined lines in one pass and split the tokens per line.
+
+    Lexer state carries over line breaks, so multi-line strings and comments
+    are highlighted correctly. Memoized, so redrawing an unchanged viewport
+    does not run the lexer again.
+    """
+
+    lines: List[List[Tuple[Any, str]]] = [[]]
+
+    for _, token_type, value in lexer.get_tokens_unprocessed(text + '\n'):
+        pieces = value.split('\n')
+        for index, piece in enumerate(pieces):
+            if index:
+                lines.append([])
+            if piece:
+                lines[-1].append((token_type, piece))
+
+    return tuple(tuple(line) for line in lines[:text.count('\n') + 1])
+
+
+def _group_name(lang_name: str) -> str:
+    """Turn a display language name into a valid regex group name."""
+    return lang_name.replace('#', 'Sharp')
+
+
+# All language patterns fused into one alternation, so detection is a single
+# pass over the sample. Each group maps to (priority, lexer path, language name).
+_LANGUAGE_RE: Final['re.Pattern[str]'] = re.compile(
+    '|'.join(
+        f'(?P<{_group_name(lang_name)}>{pattern})'
+        for pattern, (_, lang_name) in LANGUAGE_PATTERNS.items()
+    ),
+    re.MULTILINE
+)
+_LANGUAGE_GROUPS: Final[Dict[str, Tuple[int, str, str]]] = {
+    _group_name(lang_name): (priority, lexer_path, lang_name)
+    for priority, (lexer_path, lang_name) in enumerate(LANGUAGE_PATTERNS.values())
 }
+_C_RE: Final['re.Pattern[str]'] = re.compile(C_PATTERN, re.MULTILINE)
+_CPP_RE: Final['re.Pattern[str]'] = re.compile(CPP_PATTERN, re.MULTILINE)
 
 TOKEN_COLOR_MAP: Final[Dict[Any, int]] = {
     Token.Keyword: SYNTAX_COLORS['keyword'],
@@ -121,6 +200,7 @@ class SyntaxHighlighter:
         self.lexer = None
         self.language = None
         self.color_pairs_initialized = False
+        self._attr_cache: Dict[Any, int] = {}
 
     def init_colors(self) -> None:
         """Initialize color pairs for syntax highlighting."""
@@ -158,26 +238,50 @@ class SyntaxHighlighter:
         except ClassNotFound:
             pass
 
-        for pattern, (lexer_class, lang_name) in LANGUAGE_PATTERNS.items():
-            if re.search(pattern, content, re.MULTILINE):
-                self.lexer = lexer_class
-                self.language = lang_name
-                return self.language
+        best = None
+        for match in _LANGUAGE_RE.finditer(content):
+            candidate = _LANGUAGE_GROUPS[match.lastgroup]
+            if best is None or candidate[0] < best[0]:
+                best = candidate
+                if best[0] == 0:
+                    break
+
+        if best:
+            _, lexer_path, self.language = best
+            self.lexer = _get_lexer(lexer_path)
+            return self.language
 
-        if re.search(C_PATTERN, content, re.MULTILINE):
-            if re.search(CPP_PATTERN, content, re.MULTILINE):
-                self.lexer = CppLexer()
+        if _C_RE.search(content):
+            if _CPP_RE.search(content):
+                self.lexer = _get_lexer(CPP_LEXER)
                 self.language = 'C++'
 
                 return self.language
 
-            self.lexer = CLexer() 
+            self.lexer = _get_lexer(C_LEXER)
             self.language = 'C'
 
             return self.language
 
         return None
 
+    @staticmethod
+    def detect_language_by_filename(filename: str) -> Optional[str]:
+        """
+        Detect the language of a file from its name alone, e.g. for a new empty file.
+
+        Unlike `detect_language`, no lexer is created or stored, and the
+        result is memoized per file name.
+
+        Args:
+            filename: The name or path of the file
+
+        Returns:
+            The detected language or None if not detected
+        """
+
+        return _language_for_filename(os.path.basename(filename))
+
     def highlight_line(self, line: str) -> List[Tuple[str, int]]:
         """
         Highlight a line of code using the detected lexer.
@@ -192,23 +296,54 @@ class SyntaxHighlighter:
         if not self.lexer or not line:
             return [(line, curses.color_pair(0))]
 
+        attr_cache = self._attr_cache
         result = []
 
-        tokens = list(self.lexer.get_tokens(line))
+        for token_type, text in _tokenize_line(self.lexer, line):
+            color_attr = attr_cache.get(token_type)
+            if color_attr is None:
+                color_attr = self._get_token_color(token_type)
 
-        for token_type, text in tokens:
-            color_attr = self._get_token_color(token_type)
+            result.append((text, color_attr))
 
-            color_attr = color_attr & ~curses.A_COLOR
-            color_attr |= curses.color_pair(TOKEN_COLOR_MAP.get(token_type, 0))
+        return result
 
-            result.append((text, color_attr))
+    def highlight_region(self, lines: List[str]) -> List[List[Tuple[str, int]]]:
+        """
+        Highlight consecutive lines of code with a single lexer pass.
+
+        Args:
+            lines: The lines to highlight, in order
+
+        Returns:
+            A list of (text, color_attr) tuple lists, one per line
+        """
+
+        if not self.lexer:
+            return [[(line, curses.color_pair(0))] for line in lines]
+
+        if not lines:
+            return []
+
+        attr_cache = self._attr_cache
+        result = []
+
+        for tokens in _tokenize_region(self.lexer, '\n'.join(lines)):
+            highlighted = []
+            for token_type, text in tokens:
+                color_attr = attr_cache.get(token_type)
+                if color_attr is None:
+                    color_attr = self._get_token_color(token_type)
+
+                highlighted.append((text, color_attr))
+
+            result.append(highlighted)
 
         return result
 
     def _get_token_color(self, token_type: Any) -> int:
         """
-        Get the color attribute for a token type.
+        Get the color attribute for a token type, memoizing the result.
 
         Args:
             token_type: The Pygments token type
@@ -217,15 +352,17 @@ class SyntaxHighlighter:
             The curses color attribute
         """
 
-        if token_type in TOKEN_COLOR_MAP:
-            return curses.color_pair(TOKEN_COLOR_MAP[token_type])
+        original_token = token_type
+        color_idx = TOKEN_COLOR_MAP.get(token_type)
 
-        while token_type.parent:
+        while color_idx is None and token_type.parent:
             token_type = token_type.parent
-            if token_type in TOKEN_COLOR_MAP:
-                return curses.color_pair(TOKEN_COLOR_MAP[token_type])
+            color_idx = TOKEN_COLOR_MAP.get(token_type)
+
+        color_attr = curses.color_pair(color_idx or 0)
+        self._attr_cache[original_token] = color_attr
 
-        return curses.color_pair(0)
+        return color_attr
     
     def get_language_name(self) -> Optional[str]:
         """Get the name of the currently detected language."""
@@ -4,12 +4,14 @@ Input handler module for processing keyboard events.
 
 import curses
 import os
-from typing import Optional, Callable, Dict, List, Final
+from functools import partial
+from typing import Optional, Callable, Dict, List, Tuple, Final
 
 from ..core.buffer import Buffer, UndoAction
 from ..core.syntax import SyntaxHighlighter
 from .window import WindowManager
 from ..utils.search import SearchEngine, SearchResult
+from ..utils.hex_utils import parse_hex_string
 
 SEARCH_MESSAGES: Final[Dict[str, str]] = {
     "text": "Search: Text mode",
@@ -25,6 +27,18 @@ REPLACE_STATUS_MESSAGE: Final[str] = "Replace mode. Type replacement text. Enter
 ONE_REPLACE_STATUS_MESSAGE: Final[str] = "Replaced 1 occurrence. Press Ctrl+N to find next match."
 OPEN_MODE_STATUS_MESSAGE: Final[str] = "Open mode. Enter file path, press Enter to open."
 
+# Prompt modes, used as the first half of the modal handler keys.
+_OPEN_MODE: Final[int] = 1
+_SEARCH_MODE: Final[int] = 2
+_REPLACE_MODE: Final[int] = 4
+_PROMPT_MODES: Final[Tuple[int, ...]] = (_OPEN_MODE, _SEARCH_MODE, _REPLACE_MODE)
+
+# Maps ASCII hex digits to their value and every other code below 128 to _NOT_HEX.
+_NOT_HEX: Final[int] = 0xFF
+_HEX_NIBBLES: Final[bytes] = bytes(
+    int(chr(c), 16) if chr(c) in '0123456789ABCDEFabcdef' else _NOT_HEX for c in range(128)
+)
+
 class InputHandler:
     """Handles keyboard input and executes corresponding actions."""
 
@@ -35,16 +49,47 @@ class InputHandler:
         self.search_mode = False
         self.replace_mode = False
         self.open_mode = False
-        self.open_query = ""
-        self.search_query = ""
-        self.replace_query = ""
+        self._query_parts: Dict[int, List[str]] = {mode: [] for mode in _PROMPT_MODES}
         self.search_type = "text"
         self.case_sensitive = False
         self.search_results: List[SearchResult] = []
         self.current_result_index = -1
         self.current_hex_digit = None
         self.command_handlers: Dict[int, Callable[[], None]] = self._setup_handlers()
-        self.search_engine = None
+        self._command_table = self._build_command_table(self.command_handlers)
+        self.modal_handlers: Dict[Tuple[int, int], Callable[[], None]] = self._setup_modal_handlers()
+        self.search_engine: Optional[SearchEngine] = None
+        self._active_buffer: Optional[Buffer] = None
+
+    @property
+    def open_query(self) -> str:
+        """Text typed into the open prompt."""
+
+        return ''.join(self._query_parts[_OPEN_MODE])
+
+    @open_query.setter
+    def open_query(self, value: str) -> None:
+        self._query_parts[_OPEN_MODE] = list(value)
+
+    @property
+    def search_query(self) -> str:
+        """Text typed into the search prompt."""
+
+        return ''.join(self._query_parts[_SEARCH_MODE])
+
+    @search_query.setter
+    def search_query(self, value: str) -> None:
+        self._query_parts[_SEARCH_MODE] = list(value)
+
+    @property
+    def replace_query(self) -> str:
+        """Text typed into the replace prompt."""
+
+        return ''.join(self._query_parts[_REPLACE_MODE])
+
+    @replace_query.setter
+    def replace_query(self, value: str) -> None:
+        self._query_parts[_REPLACE_MODE] = list(value)
 
     def _setup_handlers(self) -> Dict[int, Callable[[], None]]:
         """Set up the keyboard command handlers."""
@@ -78,81 +123,79 @@ class InputHandler:
             ord('p') & 0x1f: self._find_previous,  # Ctrl + P (find previous key)
         }
 
-    def handle_input(self, ch: int) -> bool:
-        """Handle a single keyboard input. Returns False if should quit."""
+    @staticmethod
+    def _build_command_table(handlers: Dict[int, Callable[[], None]]) -> List[Optional[Callable[[], None]]]:
+        """Lay the command handlers out in a list indexed directly by key code."""
 
-        if self.open_mode or self.search_mode or self.replace_mode:
-            # Enter
-            if ch == ord('\n'):
-                if self.open_mode:
-                    self._execute_open()
-                elif self.search_mode:
-                    self._execute_search()
-                elif self.replace_mode:
-                    self._execute_replace()
+        table: List[Optional[Callable[[], None]]] = [None] * (max(curses.KEY_MAX, *handlers) + 1)
+        for ch, handler in handlers.items():
+            table[ch] = handler
 
-                return True
+        return table
 
-            # Escape
-            if ch == 27:
-                # Check for Alt+Number combinations
-                try:
-                    next_ch = self.window_manager.stdscr.getch()
-                    if ord('1') <= next_ch <= ord('9') and not self.insert_mode:
-                        index = next_ch - ord('1')
-                        self.window_manager.switch_buffer(index)
-                        return True
-                    elif next_ch == ord('c'):  # Alt+C - toggle case sensitivity
-                        self.case_sensitive = not self.case_sensitive
-                        self.window_manager.status_message = f"Case sensitivity: {'On' if self.case_sensitive else 'Off'}"
-                        return True
-                except:
-                    pass
-
-                # Reset mode and query
-                if self.open_mode:
-                    self.open_mode = False
-                    self.open_query = ""
-                elif self.search_mode:
-                    self.search_mode = False
-                    self.search_query = ""
-                elif self.replace_mode:
-                    self.replace_mode = False
-                    self.replace_query = ""
+    def _setup_modal_handlers(self) -> Dict[Tuple[int, int], Callable[[], None]]:
+        """Set up the key handlers of the open, search and replace prompts, keyed by (mode, key)."""
 
-                return True
+        handlers: Dict[Tuple[int, int], Callable[[], None]] = {
+            (_OPEN_MODE, ord('\n')): self._execute_open,
+            (_SEARCH_MODE, ord('\n')): self._execute_search,
+            (_REPLACE_MODE, ord('\n')): self._execute_replace,
+            (_SEARCH_MODE, 9): self._cycle_search_type,  # Tab
+            (_REPLACE_MODE, ord('a') & 0x1f): self._replace_all,  # Ctrl + A
+        }
 
-            # Tab
-            if ch == 9 and self.search_mode:
-                self._cycle_search_type()
-                return True
+        for mode in _PROMPT_MODES:
+            handlers[(mode, 27)] = partial(self._cancel_prompt, mode)
+            handlers[(mode, curses.KEY_BACKSPACE)] = partial(self._query_backspace, mode)
+            handlers[(mode, 127)] = partial(self._query_backspace, mode)
 
-            # Ctrl+A
-            if ch == ord('a') & 0x1f and self.replace_mode:
-                self._replace_all()
-                return True
+        return handlers
 
-            # Backspace
-            if ch == curses.KEY_BACKSPACE or ch == 127:
-                if self.open_mode and self.open_query:
-                    self.open_query = self.open_query[:-1]
-                elif self.search_mode and self.search_query:
-                    self.search_query = self.search_query[:-1]
-                elif self.replace_mode and self.replace_query:
-                    self.replace_query = self.replace_query[:-1]
+    def _cancel_prompt(self, mode: int) -> None:
+        """Handle Escape in a prompt: Alt combinations, or leaving the prompt."""
 
-                return True
+        # Check for Alt+Number combinations
+        try:
+            next_ch = self.window_manager.stdscr.getch()
+            if ord('1') <= next_ch <= ord('9') and not self.insert_mode:
+                index = next_ch - ord('1')
+                self.window_manager.switch_buffer(index)
+                return
+            elif next_ch == ord('c'):  # Alt+C - toggle case sensitivity
+                self.case_sensitive = not self.case_sensitive
+                self.window_manager.status_message = f"Case sensitivity: {'On' if self.case_sensitive else 'Off'}"
+                return
+        except:
+            pass
+
+        # Reset mode and query
+        if mode == _OPEN_MODE:
+            self.open_mode = False
+        elif mode == _SEARCH_MODE:
+            self.search_mode = False
+        else:
+            self.replace_mode = False
 
-            # Printable characters
-            if 32 <= ch <= 126:
-                if self.open_mode:
-                    self.open_query += chr(ch)
-                elif self.search_mode:
-                    self.search_query += chr(ch)
-                elif self.replace_mode:
-                    self.replace_query += chr(ch)
+        self._query_parts[mode].clear()
 
-                return True
+    def _query_backspace(self, mode: int) -> None:
+        """Remove the last character of the query of a prompt."""
+
+        parts = self._query_parts[mode]
+        if parts:
+            parts.pop()
+
+    def handle_input(self, ch: int) -> bool:
+        """Handle a single keyboard input. Returns False if should quit."""
+
+        if self.open_mode or self.search_mode or self.replace_mode:
+            mode = _OPEN_MODE if self.open_mode else _SEARCH_MODE if self.search_mode else _REPLACE_MODE
+
+            handler = self.modal_handlers.get((mode, ch))
+            if handler:
+                handler()
+            elif 32 <= ch <= 126:  # Printable characters
+                self._query_parts[mode].append(chr(ch))
 
             return True
 
@@ -167,7 +210,8 @@ class InputHandler:
                 pass
             return True
 
-        buf = self.window_manager.get_active_buffer()
+        # Cached for the key handlers below, so they do not look it up again.
+        buf = self._active_buffer = self.window_manager.get_active_buffer()
         if not buf:
             return True
 
@@ -176,28 +220,28 @@ class InputHandler:
                 self._handle_code_input(ch)
                 return True
 
-        if self.insert_mode and self._is_hex_char(ch):
+        if self.insert_mode and 0 <= ch < 128 and _HEX_NIBBLES[ch] != _NOT_HEX:
             self._handle_hex_input(ch)
             return True
 
-        if ch in self.command_handlers:
-            self.command_handlers[ch]()
-            return True
+        handler = self._command_table[ch] if 0 <= ch < len(self._command_table) else None
+        if handler:
+            handler()
 
         return True
 
     def _is_hex_char(self, ch: int) -> bool:
         """Check if character is a valid hex digit."""
-        return (0x30 <= ch <= 0x39) or (0x41 <= ch <= 0x46) or (0x61 <= ch <= 0x66)
+        return 0 <= ch < 128 and _HEX_NIBBLES[ch] != _NOT_HEX
 
     def _handle_hex_input(self, ch: int) -> None:
         """Handle hex digit input in insert mode."""
 
-        buf = self.window_manager.get_active_buffer()
+        buf = self._active_buffer
         if not buf:
             return
 
-        hex_value = int(chr(ch), 16)
+        hex_value = _HEX_NIBBLES[ch]
 
         if self.current_hex_digit is None:
             self.current_hex_digit = hex_value << 4
@@ -212,11 +256,11 @@ class InputHandler:
     def _handle_code_input(self, ch: int) -> None:
         """Handle text input in code editing mode."""
 
-        buf = self.window_manager.get_active_buffer()
+        buf = self._active_buffer
         if not buf or not buf.is_code_file:
             return
 
-        char = chr(ch)
+        text = self._read_printable_run(ch)
 
         if len(buf.code_lines) == 0:
             buf.code_lines.append('')
@@ -225,17 +269,51 @@ class InputHandler:
         
         current_line = buf.get_code_line(buf.cursor_line)
 
-        new_line = current_line[:buf.cursor_column] + char + current_line[buf.cursor_column:]
+        new_line = current_line[:buf.cursor_column] + text + current_line[buf.cursor_column:]
 
         buf.code_lines[buf.cursor_line] = new_line
         buf.modified = True
 
-        buf.cursor_column += 1
+        buf.cursor_column += len(text)
+
+    def _read_printable_run(self, ch: int) -> str:
+        """
+        Collect `ch` and any printable characters already waiting in the input queue.
+
+        Pasted text arrives as a burst of key presses; inserting it as one
+        string avoids rebuilding the line and redrawing once per character.
+        The first non-printable key is pushed back for the main loop.
+
+        Args:
+            ch: The printable key that was just read
+
+        Returns:
+            The collected text
+        """
+
+        chars = [chr(ch)]
+        stdscr = self.window_manager.stdscr
+
+        stdscr.nodelay(True)
+        try:
+            while True:
+                next_ch = stdscr.getch()
+                if 32 <= next_ch <= 126:
+                    chars.append(chr(next_ch))
+                    continue
+
+                if next_ch != -1:
+                    curses.ungetch(next_ch)
+                break
+        finally:
+            stdscr.timeout(WindowManager.INPUT_TIMEOUT)
+
+        return ''.join(chars)
 
     def _move_left(self) -> None:
         """Move cursor left."""
 
-        buf = self.window_manager.get_active_buffer()
+        buf = self._active_buffer
         if not buf:
             return
 
@@ -255,7 +333,7 @@ class InputHandler:
     def _move_right(self) -> None:
         """Move cursor right."""
 
-        buf = self.window_manager.get_active_buffer()
+        buf = self._active_buffer
         if not buf:
             return
 
@@ -276,7 +354,7 @@ class InputHandler:
     def _move_up(self) -> None:
         """Move cursor up one line."""
 
-        buf = self.window_manager.get_active_buffer()
+        buf = self._active_buffer
         if not buf:
             return
 
@@ -298,7 +376,7 @@ class InputHandler:
     def _move_down(self) -> None:
         """Move cursor down one line."""
 
-        buf = self.window_manager.get_active_buffer()
+        buf = self._active_buffer
         if not buf:
             return
 
@@ -320,7 +398,7 @@ class InputHandler:
     def _move_line_start(self) -> None:
         """Move cursor to start of line."""
 
-        buf = self.window_manager.get_active_buffer()
+        buf = self._active_buffer
         if not buf:
             return
 
@@ -333,7 +411,7 @@ class InputHandler:
     def _move_line_end(self) -> None:
         """Move cursor to end of line."""
 
-        buf = self.window_manager.get_active_buffer()
+        buf = self._active_buffer
         if not buf:
             return
 
@@ -349,12 +427,13 @@ class InputHandler:
     def _page_up(self) -> None:
         """Move cursor up one page."""
 
-        buf = self.window_manager.get_active_buffer()
+        buf = self._active_buffer
         if not buf:
             return
 
         if not buf.is_code_file:
             page_size = (self.window_manager.height - 3) * buf.bytes_per_line
+            buf.set_access_pattern('sequential')
             buf.cursor_pos = max(0, buf.cursor_pos - page_size)
             return
 
@@ -371,12 +450,13 @@ class InputHandler:
     def _page_down(self) -> None:
         """Move cursor down one page."""
 
-        buf = self.window_manager.get_active_buffer()
+        buf = self._active_buffer
         if not buf:
             return
 
         if not buf.is_code_file:
             page_size = (self.window_manager.height - 3) * buf.bytes_per_line
+            buf.set_access_pattern('sequential')
             buf.cursor_pos = min(buf.get_size() - 1, buf.cursor_pos + page_size)
             return
 
@@ -393,7 +473,7 @@ class InputHandler:
     def _delete_char(self) -> None:
         """Delete character at cursor."""
 
-        buf = self.window_manager.get_active_buffer()
+        buf = self._active_buffer
         if not buf:
             return
 
@@ -409,20 +489,12 @@ class InputHandler:
             return
 
         if buf.cursor_line < len(buf.code_lines) - 1:
-            next_line = buf.get_code_line(buf.cursor_line + 1)
-
-            current_cursor_column = buf.cursor_column
-            buf.code_lines[buf.cursor_line] = line + next_line
-
-            buf.delete_line(buf.cursor_line + 1)
-
-            buf.cursor_column = current_cursor_column
-            buf.modified = True
+            buf.join_lines(buf.cursor_line)
 
     def _backspace(self) -> None:
         """Delete character before cursor."""
 
-        buf = self.window_manager.get_active_buffer()
+        buf = self._active_buffer
         if not buf:
             return
 
@@ -441,24 +513,18 @@ class InputHandler:
             return
 
         if buf.cursor_line > 0:
-            prev_line = buf.get_code_line(buf.cursor_line - 1)
-            current_line = buf.get_code_line(buf.cursor_line)
-
-            new_cursor_column = len(prev_line)
+            new_cursor_column = len(buf.get_code_line(buf.cursor_line - 1))
 
-            buf.code_lines[buf.cursor_line - 1] = prev_line + current_line
-
-            buf.delete_line(buf.cursor_line)
+            buf.join_lines(buf.cursor_line - 1)
 
             buf.cursor_line -= 1
             buf.cursor_column = new_cursor_column
-            buf.modified = True
             return
 
     def _handle_enter(self) -> None:
         """Handle enter key press."""
 
-        buf = self.window_manager.get_active_buffer()
+        buf = self._active_buffer
         if not buf:
             return
 
@@ -479,26 +545,12 @@ class InputHandler:
             buf.modified = True
             return
 
-        current_line_index = buf.cursor_line
-        current_line = buf.get_code_line(current_line_index)
-
-        text_before_cursor = current_line[:buf.cursor_column]
-        text_after_cursor = current_line[buf.cursor_column:]
-
-        buf.code_lines[current_line_index] = text_before_cursor
-
-        old_cursor_line = buf.cursor_line
-
-        buf.code_lines.insert(current_line_index + 1, text_after_cursor)
-
-        buf.cursor_line = old_cursor_line + 1
-        buf.cursor_column = 0
-        buf.modified = True
+        buf.split_line(buf.cursor_line, buf.cursor_column)
 
     def _handle_tab(self) -> None:
         """Toggle between hex and ASCII views."""
 
-        buf = self.window_manager.get_active_buffer()
+        buf = self._active_buffer
         if not buf:
             return
 
@@ -629,8 +681,10 @@ class InputHandler:
             self.search_mode = False
             return
 
-        if not self.search_engine or self.search_engine.buffer != buf:
+        if not self.search_engine:
             self.search_engine = SearchEngine(buf)
+        elif self.search_engine.buffer is not buf:
+            self.search_engine.buffer = buf
 
         self.search_results = self.search_engine.find_all(
             self.search_query, 
@@ -648,15 +702,12 @@ class InputHandler:
         result = self.search_results[0]
 
         if buf.is_code_file:
-            line_start = 0
-            for i, line in enumerate(buf.code_lines):
-                line_length = len(line.encode('utf-8')) + 1
-                if line_start <= result.position < line_start + line_length:
-                    buf.cursor_line = i
-                    buf.cursor_column = result.position - line_start
-                    break
-                line_start += line_length
+            located = buf.locate_code_position(result.position)
+            if located:
+                buf.cursor_line, line_start = located
+                buf.cursor_column = result.position - line_start
         else:
+            buf.set_access_pattern('random')
             buf.cursor_pos = result.position
 
         self.window_manager.status_message = (
@@ -684,15 +735,12 @@ class InputHandler:
             return
 
         if buf.is_code_file:
-            line_start = 0
-            for i, line in enumerate(buf.code_lines):
-                line_length = len(line.encode('utf-8')) + 1
-                if line_start <= result.position < line_start + line_length:
-                    buf.cursor_line = i
-                    buf.cursor_column = result.position - line_start
-                    break
-                line_start += line_length
+            located = buf.locate_code_position(result.position)
+            if located:
+                buf.cursor_line, line_start = located
+                buf.cursor_column = result.position - line_start
         else:
+            buf.set_access_pattern('random')
             buf.cursor_pos = result.position
 
         self.window_manager.status_message = (
@@ -717,15 +765,12 @@ class InputHandler:
             return
 
         if buf.is_code_file:
-            line_start = 0
-            for i, line in enumerate(buf.code_lines):
-                line_length = len(line.encode('utf-8')) + 1
-                if line_start <= result.position < line_start + line_length:
-                    buf.cursor_line = i
-                    buf.cursor_column = result.position - line_start
-                    break
-                line_start += line_length
+            located = buf.locate_code_position(result.position)
+            if located:
+                buf.cursor_line, line_start = located
+                buf.cursor_column = result.position - line_start
         else:
+            buf.set_access_pattern('random')
             buf.cursor_pos = result.position
 
         self.window_manager.status_message = (
@@ -755,9 +800,16 @@ class InputHandler:
             self.replace_mode = False
             return
 
+        replace_query = self.replace_query
+        replacement_bytes = self._parse_replacement(replace_query)
+        if replacement_bytes is None:
+            self.window_manager.status_message = "Invalid hex format in replacement"
+            self.replace_mode = False
+            return
+
         result = self.search_results[self.current_result_index]
 
-        self._replace_match(buf, result)
+        self._replace_match(buf, result, replace_query, replacement_bytes)
 
         self._execute_search()
         self.replace_mode = False
@@ -776,10 +828,12 @@ class InputHandler:
             self.replace_mode = False
             return
 
-        count = 0
-
-        results_copy = self.search_results.copy()
-        results_copy.sort(key=lambda r: r.position, reverse=True)
+        replace_query = self.replace_query
+        replacement_bytes = self._parse_replacement(replace_query)
+        if replacement_bytes is None:
+            self.window_manager.status_message = "Invalid hex format in replacement"
+            self.replace_mode = False
+            return
 
         batch_action = UndoAction(
             position=0,
@@ -788,15 +842,10 @@ class InputHandler:
             action_type='batch_replace'
         )
 
-        for result in results_copy:
-            action = self._prepare_replace_action(buf, result)
-            if not action:
-                continue
-
-            batch_action.batch_actions.append(action)
-
-            self._perform_replacement(buf, result)
-            count += 1
+        if buf.is_code_file:
+            count = self._replace_all_lines(buf, self.search_results, replace_query, batch_action)
+        else:
+            count = self._replace_all_bytes(buf, self.search_results, replacement_bytes, batch_action)
 
         if count > 0:
             buf.undo_stack.append(batch_action)
@@ -807,136 +856,188 @@ class InputHandler:
 
         self.window_manager.status_message = f"Replaced {count} occurrences."
 
-    def _prepare_replace_action(self, buf: Buffer, result: SearchResult) -> Optional[UndoAction]:
-        """Prepare a replacement action without performing the replacement."""
+    def _replace_all_bytes(self, buf: Buffer, results: List[SearchResult],
+                           replacement_bytes: bytes, batch_action: UndoAction) -> int:
+        """
+        Replace every search result in a binary buffer with a single rebuild of its data.
+
+        Overlapping results are skipped, so each replaced range is taken from
+        the original data. When every result is as long as the replacement,
+        the bytes are overwritten in place and nothing is moved or copied.
+
+        Args:
+            buf: The buffer to edit
+            results: The search results, in any order
+            replacement_bytes: The bytes to put in place of every result
+            batch_action: Batch undo action that receives a single
+                'replace_batch' action covering every replacement
+
+        Returns:
+            int: The number of replacements made
+        """
+
+        spans = []
+        cursor = 0
+        for start, end in sorted((result.position, result.position + result.length) for result in results):
+            if start < cursor:
+                continue
 
-        if self.search_type == 'hex':
-            try:
-                replacement_bytes = bytes.fromhex(''.join(self.replace_query.split()))
-            except ValueError:
-                return None
-        else:
-            replacement_bytes = self.replace_query.encode('utf-8')
+            spans.append((start, end))
+            cursor = end
 
-        if not buf.is_code_file:
-            old_data = buf.data[result.position:result.position + result.length]
+        action = buf.replace_ranges(spans, replacement_bytes)
+        if action is None:
+            return 0
 
-            return UndoAction(
-                position=result.position,
-                old_data=bytes(old_data),
-                new_data=replacement_bytes,
-                action_type='replace_range'
-            )
+        batch_action.batch_actions.append(action)
+        buf.cursor_pos = spans[0][0] + len(replacement_bytes)
 
-        line_start = 0
-        for i, line in enumerate(buf.code_lines):
-            line_length = len(line.encode('utf-8')) + 1
-            if line_start <= result.position < line_start + line_length:
-                old_line = buf.code_lines[i]
+        return len(spans)
 
-                col_start = result.position - line_start
-                col_end = col_start + result.length
+    def _replace_all_lines(self, buf: Buffer, results: List[SearchResult],
+                           replace_query: str, batch_action: UndoAction) -> int:
+        """
+        Replace every search result in a code buffer, rebuilding each affected line once.
 
-                new_line = line[:col_start] + self.replace_query + line[col_end:]
+        Overlapping results within a line are skipped, so each replaced range
+        is taken from the original line.
 
-                return UndoAction(
-                    position=i,
-                    old_data=old_line.encode('utf-8'),
-                    new_data=new_line.encode('utf-8'),
-                    action_type='replace_line'
-                )
+        Args:
+            buf: The buffer to edit
+            results: The search results, in any order
+            replace_query: The text to put in place of every result
+            batch_action: Batch undo action that receives one 'replace_line_delta'
+                action per replacement, holding only the replaced fragment
 
-            line_start += line_length
+        Returns:
+            int: The number of replacements made
+        """
 
-        return None
+        hits: Dict[int, List[Tuple[int, int]]] = {}
+        positions = [result.position for result in results]
 
-    def _perform_replacement(self, buf: Buffer, result: SearchResult) -> None:
-        """Perform the actual replacement without creating an undo action."""
+        for result, located in zip(results, buf.locate_code_positions(positions)):
+            if located is None:
+                continue
+
+            line_index, line_start = located
+            hits.setdefault(line_index, []).append((result.position - line_start, result.length))
+
+        count = 0
+
+        for line_index in sorted(hits, reverse=True):
+            line = buf.code_lines[line_index]
+            parts = []
+            cursor = 0
+            written = 0
+
+            for col_start, length in sorted(hits[line_index]):
+                if col_start < cursor:
+                    continue
+
+                kept = line[cursor:col_start]
+                parts.append(kept)
+                parts.append(replace_query)
+                written += len(kept)
+                cursor = col_start + length
+                count += 1
+
+                # Columns are recorded as they are after the earlier replacements in the line
+                batch_action.batch_actions.append(UndoAction(
+                    position=line_index,
+                    old_data=line[col_start:cursor],
+                    new_data=replace_query,
+                    action_type='replace_line_delta',
+                    column=written
+                ))
+                written += len(replace_query)
+
+            parts.append(line[cursor:])
+            buf.code_lines[line_index] = ''.join(parts)
+
+        if count:
+            first_line = min(hits)
+            buf.cursor_line = first_line
+            buf.cursor_column = min(hits[first_line])[0] + len(replace_query)
+            buf.modified = True
+
+        return count
+
+    def _parse_replacement(self, replace_query: str) -> Optional[bytes]:
+        """Get the replace query as bytes, or None if it is not valid hex in hex mode."""
 
         if self.search_type == 'hex':
-            try:
-                replacement_bytes = bytes.fromhex(''.join(self.replace_query.split()))
-            except ValueError:
-                self.window_manager.status_message = "Invalid hex format in replacement"
-                return
-        else:
-            replacement_bytes = self.replace_query.encode('utf-8')
+            return parse_hex_string(replace_query)
+
+        return replace_query.encode('utf-8')
+
+    def _replace_match(self, buf: Buffer, result: SearchResult,
+                       replace_query: str, replacement_bytes: bytes) -> None:
+        """
+        Replace a single match in the buffer.
+
+        Args:
+            buf: The buffer to edit
+            result: The match to replace
+            replace_query: The replacement text, used for code buffers
+            replacement_bytes: The parsed replacement, used for binary buffers
+        """
 
         if buf.is_code_file:
-            line_start = 0
-            for i, line in enumerate(buf.code_lines):
-                line_length = len(line.encode('utf-8')) + 1
-                if line_start <= result.position < line_start + line_length:
-                    col_start = result.position - line_start
-                    col_end = col_start + result.length
-
-                    new_line = line[:col_start] + self.replace_query + line[col_end:]
-                    buf.code_lines[i] = new_line
-
-                    buf.cursor_line = i
-                    buf.cursor_column = col_start + len(self.replace_query)
-                    break
-                line_start += line_length
-        else:
-            buf.data[result.position:result.position + result.length] = replacement_bytes
-            buf.cursor_pos = result.position + len(replacement_bytes)
+            located = buf.locate_code_position(result.position)
+            if located is None:
+                return
 
-        buf.modified = True
+            i, line_start = located
+            line = buf.code_lines[i]
 
-    def _replace_match(self, buf: Buffer, result: SearchResult) -> None:
-        """Replace a single match in the buffer."""
+            col_start = min(result.position - line_start, len(line))
+            col_end = col_start + result.length
+            old_fragment = line[col_start:col_end]
 
-        if self.search_type == 'hex':
-            try:
-                replacement_bytes = bytes.fromhex(''.join(self.replace_query.split()))
-            except ValueError:
-                self.window_manager.status_message = "Invalid hex format in replacement"
+            buf.cursor_line = i
+            buf.cursor_column = col_start + len(replace_query)
+
+            if old_fragment == replace_query:
                 return
-        else:
-            replacement_bytes = self.replace_query.encode('utf-8')
 
-        if buf.is_code_file:
-            line_start = 0
-            for i, line in enumerate(buf.code_lines):
-                line_length = len(line.encode('utf-8')) + 1
-                if line_start <= result.position < line_start + line_length:
-                    col_start = result.position - line_start
-                    col_end = col_start + result.length
-
-                    old_line = buf.code_lines[i]
-
-                    new_line = line[:col_start] + self.replace_query + line[col_end:]
-                    buf.code_lines[i] = new_line
-
-                    action = UndoAction(
-                        position=i,
-                        old_data=old_line.encode('utf-8'),
-                        new_data=new_line.encode('utf-8'),
-                        action_type='replace_line'
-                    )
-                    buf.undo_stack.append(action)
-                    buf.redo_stack.clear()
-
-                    buf.cursor_line = i
-                    buf.cursor_column = col_start + len(self.replace_query)
-                    break
-                line_start += line_length
+            buf.code_lines[i] = ''.join((line[:col_start], replace_query, line[col_end:]))
+
+            action = UndoAction(
+                position=i,
+                old_data=old_fragment,
+                new_data=replace_query,
+                action_type='replace_line_delta',
+                column=col_start
+            )
         else:
-            old_data = buf.data[result.position:result.position + result.length]
+            start = result.position
+            end = start + result.length
+
+            buf.cursor_pos = start + len(replacement_bytes)
+
+            with memoryview(buf.data) as view:
+                if view[start:end] == replacement_bytes:
+                    return
+
+                old_data = view[start:end].tobytes()
+                if len(replacement_bytes) == result.length:
+                    view[start:end] = replacement_bytes
+
+            if len(replacement_bytes) != result.length:
+                buf.data[start:end] = replacement_bytes
+
+            buf.mark_data_changed(start, end if len(replacement_bytes) == result.length else None)
 
             action = UndoAction(
-                position=result.position,
-                old_data=bytes(old_data),
+                position=start,
+                old_data=old_data,
                 new_data=replacement_bytes,
                 action_type='replace_range'
             )
-            buf.undo_stack.append(action)
-            buf.redo_stack.clear()
-
-            buf.data[result.position:result.position + result.length] = replacement_bytes
-
-            buf.cursor_pos = result.position + len(replacement_bytes)
 
+        buf.undo_stack.append(action)
+        buf.redo_stack.clear()
         buf.modified = True
 
     def _undo(self) -> None:
@@ -967,8 +1068,7 @@ class InputHandler:
         line_start = (buf.cursor_pos // buf.bytes_per_line) * buf.bytes_per_line
         line_end = min(line_start + buf.bytes_per_line, buf.get_size())
         # TODO: Implement clipboard functionality
-        for i in range(line_end - 1, line_start - 1, -1):
-            buf.delete_byte(i)
+        buf.delete_range(line_start, line_end)
 
     def _paste_line(self) -> None:
         """Paste last cut line."""
@@ -984,7 +1084,9 @@ class InputHandler:
             return
 
         try:
-            path = os.path.expanduser(self.open_query)
+            path = self.open_query
+            if path.startswith('~'):
+                path = os.path.expanduser(path)
 
             active_buffer = self.window_manager.get_active_buffer()
             if active_buffer and not active_buffer.filename:
@@ -1006,8 +1108,7 @@ class InputHandler:
                 buf.is_code_file = True
                 buf.edit_mode = True
                 
-                highlighter = SyntaxHighlighter()
-                buf.language = highlighter.detect_language(path, '')
+                buf.language = SyntaxHighlighter.detect_language_by_filename(path)
                 
                 self.window_manager.add_buffer(buf)
                 self.window_manager.status_message = f"Created new file: {path}"
@@ -3,9 +3,9 @@ Window management module for the hex editor UI.
 """
 
 import curses
-import os
 import time
-from typing import List, Optional, TYPE_CHECKING
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 from ..core.buffer import Buffer
 from ..core.syntax import SyntaxHighlighter
 
@@ -33,6 +33,31 @@ def safe_addstr(window: 'curses.window', y: int, x: int, string: str, attr: int
         pass
 
 
+def safe_chgat(window: 'curses.window', y: int, x: int, num: int, attr: int) -> None:
+    """Safely change the attributes of already drawn cells without rewriting them."""
+
+    try:
+        window.chgat(y, x, num, attr)
+    except curses.error:
+        pass
+
+
+def new_window(height: int, width: int, y: int, x: int) -> 'curses.window':
+    """
+    Create a window that never has to track the hardware cursor.
+
+    The editor hides the terminal cursor and draws its own, so `leaveok` lets
+    curses skip the cursor motion after each update, and disabling the
+    insert/delete heuristics keeps it from scrolling small windows around.
+    """
+
+    window = curses.newwin(height, width, y, x)
+    window.leaveok(True)
+    window.idcok(False)
+    window.idlok(False)
+    return window
+
+
 class WindowManager:
     """Manages the curses windows and UI layout."""
 
@@ -40,6 +65,13 @@ class WindowManager:
     STATUS_MESSAGE_DURATION = 3
     LINE_NUMBER_WIDTH = 6
     SEARCH_HIGHLIGHT_COLOR = 8
+    INPUT_TIMEOUT = 100
+    FRAME_INTERVAL = 1 / 60
+    SEARCH_HELP = {
+        "wildcard": "Wildcard: ? = one character, * = any number of characters",
+        "hex": "Hex: Enter space-separated hex values (e.g. 'FF 00 A3')",
+        "regex": "Regex: Enter a regular expression pattern",
+    }
 
     def __init__(self, stdscr: 'curses.window'):
         self.stdscr = stdscr
@@ -58,13 +90,18 @@ class WindowManager:
         self.summary_window: Optional['curses.window'] = None
         self.tab_window: Optional['curses.window'] = None
         self.dialog_window: Optional['curses.window'] = None
+        self._dialogs: Dict[str, 'curses.window'] = {}
+        self._dialog_static_drawn: Optional[str] = None
+        self._drawn_state: Dict[str, Any] = {}
+        self._last_frame: Optional[str] = None
+        self._status_prefix_cache: Optional[Tuple[Any, str]] = None
         self.input_handler: Optional['InputHandler'] = None
         self.status_message: Optional[str] = None
         self.status_message_time = 0
+        self.last_refresh_time = 0.0
+        self._result_index: Optional[Tuple[List[Any], List[int], int]] = None
+        self._language_attempt: Optional[str] = None
         
-        self.syntax_highlighter = SyntaxHighlighter()
-        self.syntax_highlighter.init_colors()
-
         curses.start_color()
         curses.init_pair(1, curses.COLOR_WHITE, -1)  # Status bar (was blue background)
         curses.init_pair(2, curses.COLOR_YELLOW, -1)  # Highlights
@@ -77,6 +114,21 @@ class WindowManager:
         curses.init_pair(9, curses.COLOR_BLACK, curses.COLOR_GREEN)   # Current search match
         curses.init_pair(10, 8, -1)  # Line numbers (gray, default background)
 
+        self.syntax_highlighter = SyntaxHighlighter()
+        self.syntax_highlighter.init_colors()
+
+        # Attributes are fixed once the pairs exist, so they are not recomputed per cell
+        self._attr_status = curses.color_pair(1) | curses.A_BOLD | curses.A_REVERSE
+        self._attr_ascii = curses.color_pair(3)
+        self._attr_ascii_cursor = self._attr_ascii | curses.A_REVERSE | curses.A_BOLD
+        self._attr_summary_top = curses.color_pair(4)
+        self._attr_summary_bottom = curses.color_pair(5)
+        self._attr_dialog = curses.color_pair(6) | curses.A_BOLD
+        self._attr_error = curses.color_pair(7) | curses.A_BOLD
+        self._attr_search = curses.color_pair(self.SEARCH_HIGHLIGHT_COLOR)
+        self._attr_current_match = curses.color_pair(self.SEARCH_HIGHLIGHT_COLOR + 1)
+        self._attr_line_number = curses.color_pair(10)
+
         self.setup_windows()
 
     def setup_windows(self) -> None:
@@ -85,95 +137,152 @@ class WindowManager:
         if self.height < 10 or self.width < 40:
             return
 
-        self.tab_window = curses.newwin(2, self.width, 0, 0)
+        self._drawn_state.clear()
+        self.tab_window = new_window(2, self.width, 0, 0)
 
         content_width = self.width - self.SUMMARY_WIDTH
         hex_width = max((content_width * 2) // 3, content_width // 2)
         ascii_width = content_width - hex_width
 
-        self.summary_window = curses.newwin(
+        self.summary_window = new_window(
             self.height - 3,
             self.SUMMARY_WIDTH,
             2,
             0
         )
 
-        self.hex_window = curses.newwin(
+        self.hex_window = new_window(
             self.height - 3,
             hex_width,
             2,
             self.SUMMARY_WIDTH
         )
 
-        self.ascii_window = curses.newwin(
+        self.ascii_window = new_window(
             self.height - 3,
             ascii_width,
             2,
             self.SUMMARY_WIDTH + hex_width
         )
 
-        self.line_numbers_window = curses.newwin(
+        self.line_numbers_window = new_window(
             self.height - 3,
             self.LINE_NUMBER_WIDTH,
             2,
             0
         )
 
-        self.code_window = curses.newwin(
+        self.code_window = new_window(
             self.height - 3,
             self.width - self.LINE_NUMBER_WIDTH,
             2,
             self.LINE_NUMBER_WIDTH
         )
+        self.code_window.bkgd(' ', curses.A_NORMAL)
 
-        self.status_window = curses.newwin(1, self.width, self.height - 1, 0)
+        self.status_window = new_window(1, self.width, self.height - 1, 0)
 
         if self.buffers:
             self.buffers[self.active_buffer_index].set_bytes_per_line(hex_width)
 
     def refresh_all(self) -> None:
-        """Refresh all windows."""
+        """Refresh all windows, skipping the tab bar and summary when they are unchanged."""
+
+        handler = self.input_handler
+        buf = self.get_active_buffer()
+        if handler and handler.open_mode:
+            frame = 'open'
+        elif handler and handler.search_mode:
+            frame = 'search'
+        elif handler and handler.replace_mode:
+            frame = 'replace'
+        elif buf:
+            frame = 'code' if buf.is_code_file else 'hex'
+        else:
+            frame = None
 
-        self.draw_tabs()
+        # Views and dialogs share screen space, so whatever was drawn before
+        # a different kind of frame may have been covered in the meantime
+        if frame != self._last_frame:
+            self._last_frame = frame
+            self._drawn_state.clear()
+            self._dialog_static_drawn = None
 
-        if self.input_handler and self.input_handler.open_mode:
+        if self._state_changed('tabs', (self.active_buffer_index,
+                                        tuple(b.basename for b in self.buffers))):
+            self.draw_tabs()
+
+        if frame == 'open':
             self.draw_open_dialog()
-        elif self.input_handler and self.input_handler.search_mode:
+        elif frame == 'search':
             self.draw_search_dialog()
-        elif self.input_handler and self.input_handler.replace_mode:
+        elif frame == 'replace':
             self.draw_replace_dialog()
-        else:
-            if self.buffers:
-                buf = self.buffers[self.active_buffer_index]
-
-                if buf.is_code_file:
-                    self.draw_line_numbers()
-                    self.draw_code_view()
-                else:
-                    self.draw_summary()
-                    self.draw_hex_view()
-                    self.draw_ascii_view()
+        elif frame == 'code':
+            self.draw_line_numbers()
+            self.draw_code_view()
+        elif frame == 'hex':
+            summary_state = (buf, buf.cursor_pos, buf.bytes_per_line, buf.modified)
+            if self._state_changed('summary', summary_state):
+                self.draw_summary()
+            self.draw_hex_view()
+            self.draw_ascii_view()
 
         self.draw_status()
         curses.doupdate()
 
+        self.last_refresh_time = time.monotonic()
+
+    def _state_changed(self, name: str, state: Any) -> bool:
+        """
+        Check whether a window has to be redrawn and remember the new state.
+
+        Args:
+            name: Name of the window
+            state: Everything the content of the window depends on
+
+        Returns:
+            bool: True if the state differs from the one last drawn
+        """
+
+        if self._drawn_state.get(name) == state:
+            return False
+
+        self._drawn_state[name] = state
+        return True
+
+    def input_pending(self) -> bool:
+        """Check whether a key is already waiting, without consuming it."""
+
+        self.stdscr.nodelay(True)
+        try:
+            ch = self.stdscr.getch()
+        finally:
+            self.stdscr.timeout(self.INPUT_TIMEOUT)
+
+        if ch == -1:
+            return False
+
+        curses.ungetch(ch)
+        return True
+
     def draw_tabs(self) -> None:
         """Draw the tab bar with open files."""
 
         if not self.tab_window:
             return
 
-        self.tab_window.clear()
-        tab_bar = ""
+        self.tab_window.erase()
+        tabs = []
         for i, buf in enumerate(self.buffers):
-            name = os.path.basename(buf.filename) if buf.filename else f"[New File {i+1}]"
+            name = buf.basename or f"[New File {i+1}]"
             if i == self.active_buffer_index:
-                tab_bar += f"[{i+1}:{name}] "
+                tabs.append(f"[{i+1}:{name}] ")
                 continue
 
-            tab_bar += f" {i+1}:{name} "
+            tabs.append(f" {i+1}:{name} ")
 
-        safe_addstr(self.tab_window, 0, 0, tab_bar)
+        safe_addstr(self.tab_window, 0, 0, "".join(tabs))
 
         self.tab_window.hline(1, 0, curses.ACS_HLINE, self.width)
         self.tab_window.noutrefresh()
@@ -185,7 +294,7 @@ class WindowManager:
             return
             
         buf = self.buffers[self.active_buffer_index]
-        self.summary_window.clear()
+        self.summary_window.erase()
 
         if buf.is_code_file:
             line = f"{buf.cursor_line + 1:08d}"
@@ -196,7 +305,7 @@ class WindowManager:
             line = f"{buf.get_cursor_line() + 1:08d}"
             col = f"{buf.get_cursor_column() + 1:08d}"
 
-        self.summary_window.attron(curses.color_pair(4))
+        self.summary_window.attron(self._attr_summary_top)
         summary_top = [
             "Summary",
             "--------",
@@ -205,9 +314,9 @@ class WindowManager:
         
         for i, line_text in enumerate(summary_top):
             safe_addstr(self.summary_window, i, 0, line_text[:8])
-        self.summary_window.attroff(curses.color_pair(4))
+        self.summary_window.attroff(self._attr_summary_top)
 
-        self.summary_window.attron(curses.color_pair(5))
+        self.summary_window.attron(self._attr_summary_bottom)
         summary_bottom = [
             line,
             col,
@@ -222,67 +331,112 @@ class WindowManager:
         for i, line_text in enumerate(summary_bottom):
             safe_addstr(self.summary_window, i + len(summary_top), 0, line_text[:8])
 
-        self.summary_window.attroff(curses.color_pair(5))
+        self.summary_window.attroff(self._attr_summary_bottom)
         self.summary_window.noutrefresh()
 
+    def _search_highlights(self, start: int, end: int) -> Dict[int, int]:
+        """
+        Map every position in [start, end) covered by a search result to its highlight attribute.
+
+        Built once per drawn view, so drawing a cell is a single dict lookup
+        instead of a scan over all search results. Where results overlap, the
+        first one covering a position decides whether it is the current match.
+
+        Args:
+            start: First visible position
+            end: Position after the last visible one
+
+        Returns:
+            dict: Highlight attribute by position
+        """
+
+        highlights: Dict[int, int] = {}
+        if not self.input_handler or not self.input_handler.search_results:
+            return highlights
+
+        search_results = self.input_handler.search_results
+        positions, max_length = self._search_result_positions(search_results)
+
+        current_result_index = self.input_handler.current_result_index
+        match_attr = self._attr_search
+        current_attr = self._attr_current_match
+        setdefault = highlights.setdefault
+
+        # No result starting before this index can reach the visible range
+        first_idx = bisect_right(positions, start - max_length)
+        last_idx = bisect_left(positions, end, first_idx)
+
+        for idx in range(first_idx, last_idx):
+            result = search_results[idx]
+            first = max(result.position, start)
+            last = min(result.position + result.length, end)
+            if first >= last:
+                continue
+
+            attr = current_attr if idx == current_result_index else match_attr
+            for pos in range(first, last):
+                setdefault(pos, attr)
+
+        return highlights
+
+    def _search_result_positions(self, search_results: List[Any]) -> Tuple[List[int], int]:
+        """
+        Get the start positions of the search results and the longest result length.
+
+        Results are produced in ascending position order, so the positions can
+        be bisected. They are computed once per search and reused by every
+        view on every redraw until the results change.
+        """
+
+        cached = self._result_index
+        if cached is None or cached[0] is not search_results or len(cached[1]) != len(search_results):
+            positions = [result.position for result in search_results]
+            max_length = max((result.length for result in search_results), default=0)
+            cached = self._result_index = (search_results, positions, max_length)
+
+        return cached[1], cached[2]
+
     def draw_hex_view(self) -> None:
         """Draw the hex editor view."""
 
         if not self.hex_window or not self.buffers:
             return
 
+        window = self.hex_window
         buf = self.buffers[self.active_buffer_index]
-        self.hex_window.clear()
+        window.erase()
 
         visible_lines = self.height - 3
+        bytes_per_line = buf.bytes_per_line
         cursor_line = buf.get_cursor_line()
         start_line = max(0, cursor_line - (visible_lines // 2))
+        first = start_line * bytes_per_line
+        last = min((start_line + visible_lines) * bytes_per_line, buf.get_size())
 
-        search_results = []
-        current_result_index = -1
-        if self.input_handler:
-            search_results = self.input_handler.search_results
-            current_result_index = self.input_handler.current_result_index
-
-        for i in range(visible_lines):
-            line_num = start_line + i
-            if line_num * buf.bytes_per_line >= buf.get_size():
-                break
-
-            hex_data, _ = buf.get_line(line_num)
-            offset = f"{line_num * buf.bytes_per_line:08X}"
-
-            safe_addstr(self.hex_window, i, 0, offset)
-            safe_addstr(self.hex_window, i, 8, "  ")
+        highlights = self._search_highlights(first, last)
+        max_bytes = max(0, (self.width - 10) // 3)
+        cursor_pos = buf.cursor_pos
+        cursor_attr = curses.A_REVERSE | curses.A_BOLD
 
-            for j, byte in enumerate(hex_data):
-                pos = 10 + j * 3
-                if pos + 2 >= self.width:
-                    break
+        for i, line_start in enumerate(range(first, last, bytes_per_line)):
+            hex_data, _ = buf.get_line(start_line + i)
+            safe_addstr(window, i, 0, f"{line_start:08X}  ")
 
-                abs_pos = line_num * buf.bytes_per_line + j
-
-                attr = curses.A_NORMAL
+            # The whole row is written at once; only highlighted cells are then recolored
+            hex_data = bytes(hex_data[:max_bytes])
+            safe_addstr(window, i, 10, hex_data.hex(' ').upper())
 
-                in_search_result = False
-                is_current_match = False
-                for idx, result in enumerate(search_results):
-                    if result.position <= abs_pos < result.position + result.length:
-                        in_search_result = True
-                        if idx == current_result_index:
-                            is_current_match = True
-                        break
+            if highlights:
+                for j in range(len(hex_data)):
+                    attr = highlights.get(line_start + j)
+                    if attr is not None:
+                        safe_chgat(window, i, 10 + j * 3, 2, attr)
 
-                if abs_pos == buf.cursor_pos:
-                    attr = curses.A_REVERSE | curses.A_BOLD
-                elif is_current_match:
-                    attr = curses.color_pair(self.SEARCH_HIGHLIGHT_COLOR + 1)
-                elif in_search_result:
-                    attr = curses.color_pair(self.SEARCH_HIGHLIGHT_COLOR)
+            cursor_j = cursor_pos - line_start
+            if 0 <= cursor_j < len(hex_data):
+                safe_chgat(window, i, 10 + cursor_j * 3, 2, cursor_attr)
 
-                safe_addstr(self.hex_window, i, pos, f"{byte:02X}", attr)
-
-        self.hex_window.noutrefresh()
+        window.noutrefresh()
 
     def draw_ascii_view(self) -> None:
         """Draw the ASCII representation view."""
@@ -290,56 +444,44 @@ class WindowManager:
         if not self.ascii_window or not self.buffers:
             return
 
+        window = self.ascii_window
         buf = self.buffers[self.active_buffer_index]
-        self.ascii_window.clear()
+        window.erase()
 
         visible_lines = self.height - 3
+        bytes_per_line = buf.bytes_per_line
         cursor_line = buf.get_cursor_line()
         start_line = max(0, cursor_line - (visible_lines // 2))
+        first = start_line * bytes_per_line
+        last = min((start_line + visible_lines) * bytes_per_line, buf.get_size())
 
-        search_results = []
-        current_result_index = -1
-        if self.input_handler:
-            search_results = self.input_handler.search_results
-            current_result_index = self.input_handler.current_result_index
-
-        for i in range(visible_lines):
-            line_num = start_line + i
-            if line_num * buf.bytes_per_line >= buf.get_size():
-                break
-
-            _, ascii_str = buf.get_line(line_num)
-
-            for j, char in enumerate(ascii_str):
-                if j >= self.width:
-                    break
-
-                abs_pos = line_num * buf.bytes_per_line + j
+        highlights = self._search_highlights(first, last)
+        ascii_attr = self._attr_ascii
+        cursor_attr = self._attr_ascii_cursor
+        cursor_pos = buf.cursor_pos
+        width = self.width
 
-                attr = curses.color_pair(3)
+        for i, line_start in enumerate(range(first, last, bytes_per_line)):
+            _, ascii_data = buf.get_line(start_line + i)
+            ascii_data = ascii_data[:width]
 
-                in_search_result = False
-                is_current_match = False
-                for idx, result in enumerate(search_results):
-                    if result.position <= abs_pos < result.position + result.length:
-                        in_search_result = True
-                        if idx == current_result_index:
-                            is_current_match = True
-                        break
+            # The whole row is written at once; only highlighted cells are then recolored
+            try:
+                window.addstr(i, 0, ascii_data.decode('ascii'), ascii_attr)
+            except curses.error:
+                pass
 
-                if abs_pos == buf.cursor_pos:
-                    attr = curses.color_pair(3) | curses.A_REVERSE | curses.A_BOLD
-                elif is_current_match:
-                    attr = curses.color_pair(self.SEARCH_HIGHLIGHT_COLOR + 1)
-                elif in_search_result:
-                    attr = curses.color_pair(self.SEARCH_HIGHLIGHT_COLOR)
+            if highlights:
+                for j in range(len(ascii_data)):
+                    attr = highlights.get(line_start + j)
+                    if attr is not None:
+                        safe_chgat(window, i, j, 1, attr)
 
-                try:
-                    self.ascii_window.addch(i, j, ord(char), attr)
-                except curses.error:
-                    pass
+            cursor_j = cursor_pos - line_start
+            if 0 <= cursor_j < len(ascii_data):
+                safe_chgat(window, i, cursor_j, 1, cursor_attr)
 
-        self.ascii_window.noutrefresh()
+        window.noutrefresh()
 
     def draw_line_numbers(self) -> None:
         """Draw line numbers for code view."""
@@ -351,19 +493,20 @@ class WindowManager:
         if not buf.is_code_file:
             return
 
-        self.line_numbers_window.clear()
+        self.line_numbers_window.erase()
 
         visible_lines = self.height - 3
         cursor_line = buf.cursor_line
         start_line = max(0, cursor_line - (visible_lines // 2))
 
+        line_count = buf.get_line_count()
         for i in range(visible_lines):
             line_num = start_line + i
-            if line_num >= buf.get_line_count():
+            if line_num >= line_count:
                 break
 
             line_str = f"{line_num + 1:4d} "
-            attr = curses.color_pair(10)
+            attr = self._attr_line_number
             if line_num == cursor_line:
                 attr |= curses.A_BOLD
 
@@ -381,23 +524,17 @@ class WindowManager:
         if not buf.is_code_file:
             return
 
-        self.code_window.clear()
+        self.code_window.erase()
 
         visible_lines = self.height - 3
         cursor_line = buf.cursor_line
         start_line = max(0, cursor_line - (visible_lines // 2))
 
-        if buf.language and buf.filename and not self.syntax_highlighter.lexer:
+        if (buf.language and buf.filename and not self.syntax_highlighter.lexer
+                and self._language_attempt != buf.filename):
+            self._language_attempt = buf.filename
             self.syntax_highlighter.detect_language(buf.filename, ''.join(buf.code_lines[:100]))
 
-        self.code_window.bkgd(' ', curses.A_NORMAL)
-
-        search_results = []
-        current_result_index = -1
-        if self.input_handler:
-            search_results = self.input_handler.search_results
-            current_result_index = self.input_handler.current_result_index
-
         if len(buf.code_lines) == 0:
             try:
                 self.code_window.addch(0, 0, ord(' '), curses.A_REVERSE)
@@ -407,15 +544,21 @@ class WindowManager:
             self.code_window.noutrefresh()
             return
 
-        line_byte_positions = []
-        byte_pos = 0
-        for line in buf.code_lines:
-            line_byte_positions.append(byte_pos)
-            byte_pos += len(line.encode('utf-8')) + 1
+        line_byte_positions = buf.get_line_offsets()
+
+        line_count = buf.get_line_count()
+        end_line = min(start_line + visible_lines, line_count)
+
+        highlights = self._search_highlights(line_byte_positions[min(start_line, line_count)],
+                                             line_byte_positions[end_line])
+
+        highlighted_lines = []
+        if self.syntax_highlighter.lexer:
+            highlighted_lines = self.syntax_highlighter.highlight_region(buf.code_lines[start_line:end_line])
 
         for i in range(visible_lines):
             line_num = start_line + i
-            if line_num >= buf.get_line_count():
+            if line_num >= line_count:
                 break
 
             line = buf.get_code_line(line_num)
@@ -429,7 +572,7 @@ class WindowManager:
                         pass
                     continue
 
-                highlighted = self.syntax_highlighter.highlight_line(line)
+                highlighted = highlighted_lines[i]
 
                 x_pos = 0
                 for text, color in highlighted:
@@ -440,219 +583,230 @@ class WindowManager:
                     attr = attr & ~curses.A_COLOR
                     attr |= (color & curses.A_COLOR)
 
-                    line_start_byte = line_byte_positions[line_num]
-
-                    for char_idx, char in enumerate(text):
-                        char_x = x_pos + char_idx
-                        char_byte_pos = line_start_byte + char_x
-
-                        char_attr = attr
-                        in_search_result = False
-                        is_current_match = False
-
-                        for idx, result in enumerate(search_results):
-                            if result.position <= char_byte_pos < result.position + result.length:
-                                in_search_result = True
-                                if idx == current_result_index:
-                                    is_current_match = True
-                                break
-
-                        if is_current_match:
-                            char_attr = curses.color_pair(self.SEARCH_HIGHLIGHT_COLOR + 1)
-                        elif in_search_result:
-                            char_attr = curses.color_pair(self.SEARCH_HIGHLIGHT_COLOR)
-
-                        if is_cursor_line and char_x == buf.cursor_column:
-                            char_attr = curses.A_REVERSE
-
-                        try:
-                            self.code_window.addch(i, char_x, ord(char), char_attr)
-                        except curses.error:
-                            pass
-
+                    safe_addstr(self.code_window, i, x_pos, text.replace('\t', ' '), attr)
                     x_pos += len(text)
-
-                if is_cursor_line and buf.cursor_column >= x_pos:
-                    try:
-                        self.code_window.addch(i, buf.cursor_column, ord(' '), curses.A_REVERSE)
-                    except curses.error:
-                        pass
             else:
                 attr = curses.A_NORMAL
                 if is_cursor_line:
                     attr |= curses.A_BOLD
 
+                safe_addstr(self.code_window, i, 0, line.replace('\t', ' '), attr)
+                x_pos = len(line)
+
+            # Search matches and the cursor only recolor cells that are already drawn
+            if highlights:
                 line_start_byte = line_byte_positions[line_num]
+                for char_x in range(x_pos):
+                    char_attr = highlights.get(line_start_byte + char_x)
+                    if char_attr is not None:
+                        safe_chgat(self.code_window, i, char_x, 1, char_attr)
+
+            if is_cursor_line:
+                if buf.cursor_column < x_pos:
+                    safe_chgat(self.code_window, i, buf.cursor_column, 1, curses.A_REVERSE)
+                else:
+                    cursor_x = buf.cursor_column if self.syntax_highlighter.lexer else x_pos
+                    try:
+                        self.code_window.addch(i, cursor_x, ord(' '), curses.A_REVERSE)
+                    except curses.error:
+                        pass
 
-                for char_idx, char in enumerate(line):
-                    char_byte_pos = line_start_byte + char_idx
+        self.code_window.noutrefresh()
 
-                    char_attr = attr
-                    in_search_result = False
-                    is_current_match = False
+    def _dialog(self, name: str, height: int) -> 'curses.window':
+        """
+        Get the persistent dialog window of a mode, centered on the screen.
 
-                    for idx, result in enumerate(search_results):
-                        if result.position <= char_byte_pos < result.position + result.length:
-                            in_search_result = True
-                            if idx == current_result_index:
-                                is_current_match = True
-                            break
+        Each mode keeps its own window, created on first use and moved and
+        resized in place when the terminal size changes.
 
-                    if is_current_match:
-                        char_attr = curses.color_pair(self.SEARCH_HIGHLIGHT_COLOR + 1)
-                    elif in_search_result:
-                        char_attr = curses.color_pair(self.SEARCH_HIGHLIGHT_COLOR)
+        Args:
+            name: Name of the dialog mode
+            height: Height of the dialog in rows
 
-                    if is_cursor_line and char_idx == buf.cursor_column:
-                        char_attr = curses.A_REVERSE
+        Returns:
+            The dialog window
+        """
 
-                    try:
-                        self.code_window.addch(i, char_idx, ord(char), char_attr)
-                    except curses.error:
-                        pass
+        width = min(80, self.width - 4)
+        y = (self.height - height) // 2
+        x = (self.width - width) // 2
 
-                if is_cursor_line:
-                    cursor_x = min(buf.cursor_column, len(line))
-                    try:
-                        if cursor_x >= len(line) or len(line) == 0:
-                            self.code_window.addch(i, cursor_x, ord(' '), curses.A_REVERSE)
-                    except curses.error:
-                        pass
+        window = self._dialogs.get(name)
+        if window is None:
+            window = self._dialogs[name] = new_window(height, width, y, x)
+        elif window.getmaxyx() != (height, width) or window.getbegyx() != (y, x):
+            try:
+                window.resize(height, width)
+                window.mvwin(y, x)
+            except curses.error:
+                window = self._dialogs[name] = new_window(height, width, y, x)
 
-        self.code_window.noutrefresh()
+        return window
 
-    def draw_open_dialog(self) -> None:
-        """Draw the open file dialog."""
+    def _draw_dialog_frame(self, window: 'curses.window', title: str, prompt: str,
+                           labels: List[Tuple[int, int, str]]) -> None:
+        """
+        Draw the parts of a dialog that do not change while it is open.
 
-        if not self.dialog_window:
-            dialog_height = 6
-            dialog_width = min(80, self.width - 4)
-            dialog_y = (self.height - dialog_height) // 2
-            dialog_x = (self.width - dialog_width) // 2
-            self.dialog_window = curses.newwin(dialog_height, dialog_width, dialog_y, dialog_x)
-        else:
-            _, dialog_width = self.dialog_window.getmaxyx()
+        Args:
+            window: The dialog window
+            title: Title shown in the top border
+            prompt: Label in front of the input field
+            labels: (y, x, text) tuples of the static help lines
+        """
 
-        self.dialog_window.clear()
-        self.dialog_window.attron(curses.color_pair(6) | curses.A_BOLD)
-        self.dialog_window.box()
+        window.erase()
+        window.attron(self._attr_dialog)
+        window.box()
 
-        title = " Open File "
-        title_x = (self.dialog_window.getmaxyx()[1] - len(title)) // 2
-        safe_addstr(self.dialog_window, 0, title_x, title)
+        title_x = (window.getmaxyx()[1] - len(title)) // 2
+        safe_addstr(window, 0, title_x, title)
+        safe_addstr(window, 2, 2, prompt)
 
-        prompt = "Enter file path:"
-        safe_addstr(self.dialog_window, 2, 2, prompt)
+        for y, x, text in labels:
+            safe_addstr(window, y, x, text)
 
-        input_x = len(prompt) + 3
-        query = "" if self.input_handler is None else self.input_handler.open_query
-        safe_addstr(self.dialog_window, 2, input_x, query + " ")
+        window.attroff(self._attr_dialog)
 
-        if len(query) < self.dialog_window.getmaxyx()[1] - input_x - 3:
-            self.dialog_window.attron(curses.A_REVERSE)
-            safe_addstr(self.dialog_window, 2, input_x + len(query), " ")
-            self.dialog_window.attroff(curses.A_REVERSE)
+    def _draw_dialog_line(self, window: 'curses.window', y: int, x: int, text: str) -> None:
+        """Draw a changing dialog line, blanking what is left of the previous text."""
 
-        safe_addstr(self.dialog_window, 4, 2, "Enter: Open/Save file")
-        safe_addstr(self.dialog_window, 4, dialog_width // 2, "Esc: Cancel")
+        field_width = window.getmaxyx()[1] - 1 - x
+        safe_addstr(window, y, x, text[:field_width].ljust(field_width))
 
-        self.dialog_window.attroff(curses.color_pair(6) | curses.A_BOLD)
-        self.dialog_window.noutrefresh()
+    def _draw_dialog_input(self, window: 'curses.window', prompt: str, query: str) -> None:
+        """Draw the input field of a dialog together with its cursor."""
 
-    def draw_search_dialog(self) -> None:
-        """Draw the search dialog."""
+        input_x = len(prompt) + 3
+        self._draw_dialog_line(window, 2, input_x, query + " ")
 
-        if not self.dialog_window:
-            dialog_height = 9
-            dialog_width = min(80, self.width - 4)
-            dialog_y = (self.height - dialog_height) // 2
-            dialog_x = (self.width - dialog_width) // 2
-            self.dialog_window = curses.newwin(dialog_height, dialog_width, dialog_y, dialog_x)
-        else:
-            _, dialog_width = self.dialog_window.getmaxyx()
+        if len(query) < window.getmaxyx()[1] - input_x - 3:
+            window.attron(curses.A_REVERSE)
+            safe_addstr(window, 2, input_x + len(query), " ")
+            window.attroff(curses.A_REVERSE)
+
+    def draw_open_dialog(self) -> None:
+        """Draw the open file dialog."""
+
+        window = self.dialog_window = self._dialog('open', 6)
+        prompt = "Enter file path:"
 
-        self.dialog_window.clear()
-        self.dialog_window.attron(curses.color_pair(6) | curses.A_BOLD)
-        self.dialog_window.box()
+        if self._dialog_static_drawn != 'open':
+            dialog_width = window.getmaxyx()[1]
+            self._draw_dialog_frame(window, " Open File ", prompt, [
+                (4, 2, "Enter: Open/Save file"),
+                (4, dialog_width // 2, "Esc: Cancel"),
+            ])
+            self._dialog_static_drawn = 'open'
+
+        query = "" if self.input_handler is None else self.input_handler.open_query
+        self._draw_dialog_input(window, prompt, query)
+        window.noutrefresh()
 
-        title = " Search "
-        title_x = (self.dialog_window.getmaxyx()[1] - len(title)) // 2
-        safe_addstr(self.dialog_window, 0, title_x, title)
+    def draw_search_dialog(self) -> None:
+        """Draw the search dialog."""
 
+        window = self.dialog_window = self._dialog('search', 9)
         prompt = "Find:"
-        safe_addstr(self.dialog_window, 2, 2, prompt)
 
-        input_x = len(prompt) + 3
-        query = "" if self.input_handler is None else self.input_handler.search_query
-        safe_addstr(self.dialog_window, 2, input_x, query + " ")
+        if self._dialog_static_drawn != 'search':
+            dialog_width = window.getmaxyx()[1]
+            self._draw_dialog_frame(window, " Search ", prompt, [
+                (6, 2, "Tab: Change search type"),
+                (7, 2, "Alt+C: Toggle case sensitivity"),
+                (6, dialog_width // 2, "Enter: Search"),
+                (7, dialog_width // 2, "Esc: Cancel"),
+            ])
+            self._dialog_static_drawn = 'search'
 
-        if len(query) < self.dialog_window.getmaxyx()[1] - input_x - 3:
-            self.dialog_window.attron(curses.A_REVERSE)
-            safe_addstr(self.dialog_window, 2, input_x + len(query), " ")
-            self.dialog_window.attroff(curses.A_REVERSE)
+        query = "" if self.input_handler is None else self.input_handler.search_query
+        self._draw_dialog_input(window, prompt, query)
 
         search_type = "text" if self.input_handler is None else self.input_handler.search_type
         case_sensitive = False if self.input_handler is None else self.input_handler.case_sensitive
-        options_text = f"Type: {search_type.capitalize()}  "
-        options_text += f"Case Sensitive: {'Yes' if case_sensitive else 'No'}"
-        safe_addstr(self.dialog_window, 4, 2, options_text)
-
-        if search_type == "wildcard":
-            help_text = "Wildcard: ? = one character, * = any number of characters"
-            safe_addstr(self.dialog_window, 5, 2, help_text)
-        elif search_type == "hex":
-            help_text = "Hex: Enter space-separated hex values (e.g. 'FF 00 A3')"
-            safe_addstr(self.dialog_window, 5, 2, help_text)
-        elif search_type == "regex":
-            help_text = "Regex: Enter a regular expression pattern"
-            safe_addstr(self.dialog_window, 5, 2, help_text)
-
-        safe_addstr(self.dialog_window, 6, 2, "Tab: Change search type")
-        safe_addstr(self.dialog_window, 7, 2, "Alt+C: Toggle case sensitivity")
-        safe_addstr(self.dialog_window, 6, dialog_width // 2, "Enter: Search")
-        safe_addstr(self.dialog_window, 7, dialog_width // 2, "Esc: Cancel")
-
-        self.dialog_window.attroff(curses.color_pair(6) | curses.A_BOLD)
-        self.dialog_window.noutrefresh()
+        options_text = (
+            f"Type: {search_type.capitalize()}  "
+            f"Case Sensitive: {'Yes' if case_sensitive else 'No'}"
+        )
+        self._draw_dialog_line(window, 4, 2, options_text)
+        self._draw_dialog_line(window, 5, 2, self.SEARCH_HELP.get(search_type, ""))
+
+        window.noutrefresh()
 
     def draw_replace_dialog(self) -> None:
         """Draw the replace dialog."""
 
-        if not self.dialog_window:
-            dialog_height = 7
-            dialog_width = min(80, self.width - 4)
-            dialog_y = (self.height - dialog_height) // 2
-            dialog_x = (self.width - dialog_width) // 2
-            self.dialog_window = curses.newwin(dialog_height, dialog_width, dialog_y, dialog_x)
+        window = self.dialog_window = self._dialog('replace', 7)
+        prompt = "Replace with:"
+
+        if self._dialog_static_drawn != 'replace':
+            dialog_width = window.getmaxyx()[1]
+            self._draw_dialog_frame(window, " Replace ", prompt, [
+                (4, 2, "Enter: Replace current match"),
+                (5, 2, "Ctrl+A: Replace all matches"),
+                (4, dialog_width // 2, "Esc: Cancel"),
+            ])
+            self._dialog_static_drawn = 'replace'
+
+        query = "" if self.input_handler is None else self.input_handler.replace_query
+        self._draw_dialog_input(window, prompt, query)
+        window.noutrefresh()
+
+    def _status_prefix(self, buf: Buffer) -> str:
+        """
+        Get the file part of the status bar, rebuilt only when the file state changes.
+
+        Args:
+            buf: The active buffer
+
+        Returns:
+            str: Name, size and mode flags of the buffer
+        """
+
+        handler = self.input_handler
+        if buf.is_code_file:
+            state = (buf, buf.basename, buf.language, len(buf.code_lines), buf.edit_mode, buf.modified)
         else:
-            _, dialog_width = self.dialog_window.getmaxyx()
+            insert_state = None
+            if handler:
+                insert_state = (handler.insert_mode, handler.current_hex_digit is not None)
 
-        self.dialog_window.clear()
-        self.dialog_window.attron(curses.color_pair(6) | curses.A_BOLD)
-        self.dialog_window.box()
+            state = (buf, buf.basename, buf.get_size(), buf.modified, insert_state)
 
-        title = " Replace "
-        title_x = (self.dialog_window.getmaxyx()[1] - len(title)) // 2
-        safe_addstr(self.dialog_window, 0, title_x, title)
+        cached = self._status_prefix_cache
+        if cached is not None and cached[0] == state:
+            return cached[1]
 
-        prompt = "Replace with:"
-        safe_addstr(self.dialog_window, 2, 2, prompt)
+        name = buf.basename or '[No Name]'
+        parts = [f" {name} "]
 
-        input_x = len(prompt) + 3
-        query = "" if self.input_handler is None else self.input_handler.replace_query
-        safe_addstr(self.dialog_window, 2, input_x, query + " ")
+        if buf.is_code_file:
+            parts.append(f"[{buf.language or 'text'}] ")
+            parts.append(f"[{len(buf.code_lines)} lines] ")
+            parts.append("[Edit] " if buf.edit_mode else "[View] ")
 
-        if len(query) < self.dialog_window.getmaxyx()[1] - input_x - 3:
-            self.dialog_window.attron(curses.A_REVERSE)
-            safe_addstr(self.dialog_window, 2, input_x + len(query), " ")
-            self.dialog_window.attroff(curses.A_REVERSE)
+            if buf.modified:
+                parts.append("[Modified] ")
 
-        safe_addstr(self.dialog_window, 4, 2, "Enter: Replace current match")
-        safe_addstr(self.dialog_window, 5, 2, "Ctrl+A: Replace all matches")
-        safe_addstr(self.dialog_window, 4, dialog_width // 2, "Esc: Cancel")
+        else:
+            parts.append(f"[{buf.get_size()} bytes] ")
+
+            if buf.modified:
+                parts.append("[Modified] ")
+
+            if handler:
+                if handler.insert_mode:
+                    if handler.current_hex_digit is not None:
+                        parts.append("[Insert:2nd] ")
+                    else:
+                        parts.append("[Insert:1st] ")
+                else:
+                    parts.append("[View] ")
 
-        self.dialog_window.attroff(curses.color_pair(6) | curses.A_BOLD)
-        self.dialog_window.noutrefresh()
+        prefix = "".join(parts)
+        self._status_prefix_cache = (state, prefix)
+        return prefix
 
     def draw_status(self) -> None:
         """Draw the status bar."""
@@ -660,8 +814,8 @@ class WindowManager:
         if not self.status_window:
             return
 
-        self.status_window.clear()
-        self.status_window.attron(curses.color_pair(1) | curses.A_BOLD | curses.A_REVERSE)
+        self.status_window.erase()
+        self.status_window.attron(self._attr_status)
 
         if self.input_handler and self.input_handler.open_mode:
             if not self.input_handler.open_query.startswith("Error:"):
@@ -670,13 +824,13 @@ class WindowManager:
                 status = self.input_handler.open_query
 
             safe_addstr(self.status_window, 0, 0, status)
-            self.status_window.attroff(curses.color_pair(1) | curses.A_BOLD | curses.A_REVERSE)
+            self.status_window.attroff(self._attr_status)
             self.status_window.noutrefresh()
             return
 
         if not self.buffers:
             safe_addstr(self.status_window, 0, 0, " No file opened - Press Ctrl+O to open a file")
-            self.status_window.attroff(curses.color_pair(1) | curses.A_BOLD | curses.A_REVERSE)
+            self.status_window.attroff(self._attr_status)
             self.status_window.noutrefresh()
             return
 
@@ -690,60 +844,33 @@ class WindowManager:
                 self.status_message_time = 0
             else:
                 if self.status_message.startswith("Error:"):
-                    self.status_window.attron(curses.color_pair(7) | curses.A_BOLD)
+                    self.status_window.attron(self._attr_error)
                 safe_addstr(self.status_window, 0, 0, " " + self.status_message)
                 if self.status_message.startswith("Error:"):
-                    self.status_window.attroff(curses.color_pair(7) | curses.A_BOLD)
-                self.status_window.attroff(curses.color_pair(1) | curses.A_BOLD | curses.A_REVERSE)
+                    self.status_window.attroff(self._attr_error)
+                self.status_window.attroff(self._attr_status)
                 self.status_window.noutrefresh()
                 return
 
-        name = os.path.basename(buf.filename) if buf.filename else '[No Name]'
-        status = f" {name} "
-
-        if buf.is_code_file:
-            status += f"[{buf.language or 'text'}] "
-            status += f"[{len(buf.code_lines)} lines] "
-
-            if buf.edit_mode:
-                status += "[Edit] "
-            else:
-                status += "[View] "
-
-            if buf.modified:
-                status += "[Modified] "
-
-        else:
-            status += f"[{buf.get_size()} bytes] "
-
-            if buf.modified:
-                status += "[Modified] "
-
-            if self.input_handler:
-                if self.input_handler.insert_mode:
-                    if self.input_handler.current_hex_digit is not None:
-                        status += "[Insert:2nd] "
-                    else:
-                        status += "[Insert:1st] "
-                else:
-                    status += "[View] "
+        status = self._status_prefix(buf)
 
         if buf.is_code_file:
-            pos_info = f"Line: {buf.cursor_line + 1} "
-            pos_info += f"Col: {buf.cursor_column + 1}"
+            pos_info = f"Line: {buf.cursor_line + 1} Col: {buf.cursor_column + 1}"
         else:
-            pos_info = f"Offset: 0x{buf.cursor_pos:08X} "
-            pos_info += f"Line: {buf.get_cursor_line() + 1} "
-            pos_info += f"Col: {buf.get_cursor_column() + 1}"
+            pos_info = (
+                f"Offset: 0x{buf.cursor_pos:08X} "
+                f"Line: {buf.get_cursor_line() + 1} "
+                f"Col: {buf.get_cursor_column() + 1}"
+            )
 
         available_width = self.width - len(pos_info) - 1
         if len(status) > available_width:
             status = status[:available_width-3] + "... "
         else:
-            status += " " * (available_width - len(status))
+            status = status.ljust(available_width)
 
         safe_addstr(self.status_window, 0, 0, status + pos_info)
-        self.status_window.attroff(curses.color_pair(1) | curses.A_BOLD | curses.A_REVERSE)
+        self.status_window.attroff(self._attr_status)
         self.status_window.noutrefresh()
 
     def add_buffer(self, buf: Buffer) -> None:
@@ -763,7 +890,7 @@ class WindowManager:
 
         self.active_buffer_index = index
         buf = self.buffers[index]
-        name = os.path.basename(buf.filename) if buf.filename else '[No Name]'
+        name = buf.basename or '[No Name]'
         self.status_message = f"Switched to: {name}"
         return True
 
@@ -784,8 +911,7 @@ class WindowManager:
             self.status_message = "Error: Terminal too small"
             return
 
-        self.dialog_window = None
-
+        self._dialog_static_drawn = None
         self.setup_windows()
         if self.hex_window and self.buffers:
             hex_width = self.hex_window.getmaxyx()[1]
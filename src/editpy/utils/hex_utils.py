@@ -2,7 +2,16 @@
 Utility functions for hex file operations.
 """
 
-from typing import Optional, Tuple
+import functools
+from typing import Dict, Final, Optional, Tuple
+
+_HEX_WHITESPACE: Final[Dict[int, None]] = str.maketrans('', '', ' \t\n\r\v\f')
+
+# Maps printable ASCII bytes to 0 and every other byte to 1.
+_BINARY_MARK: Final[bytes] = bytes(0 if 32 <= b <= 126 else 1 for b in range(256))
+
+# Bytes of a file sample classified at a time by `is_hex_file`.
+_SAMPLE_STRIPE: Final[int] = 4096
 
 
 def is_hex_file(filename: str, sample_size: int = 512) -> bool:
@@ -24,10 +33,21 @@ def is_hex_file(filename: str, sample_size: int = 512) -> bool:
         if not data:
             return False
 
-        printable = sum(32 <= b <= 126 for b in data)
-        binary = len(data) - printable
+        # Large samples are classified stripe by stripe, stopping as soon as
+        # the rest of the sample can no longer change the outcome
+        total = len(data)
+        binary = 0
+
+        for start in range(0, total, _SAMPLE_STRIPE):
+            binary += data[start:start + _SAMPLE_STRIPE].translate(_BINARY_MARK).count(1)
+            if binary / total > 0.3:
+                return True
 
-        return (binary / len(data)) > 0.3
+            remaining = max(0, total - start - _SAMPLE_STRIPE)
+            if (binary + remaining) / total <= 0.3:
+                return False
+
+        return False
 
     except Exception:
         pass
@@ -35,10 +55,18 @@ def is_hex_file(filename: str, sample_size: int = 512) -> bool:
     return False
 
 
+@functools.lru_cache(maxsize=64)
 def parse_hex_string(hex_str: str) -> Optional[bytes]:
     """
     Parse a hex string into bytes.
 
+    Well-formed input, where whitespace only separates byte pairs, is decoded
+    in a single pass by `bytes.fromhex`, which validates every digit itself.
+    Only input with whitespace inside a pair (e.g. "F F") has its whitespace
+    removed first, with a single `str.translate` pass.
+    Results are memoized, so searching or replacing every match of the same
+    pattern decodes it only once.
+
     Args:
         hex_str (str): String of hex values (e.g. "FF 00 A5")
 
@@ -47,13 +75,13 @@ def parse_hex_string(hex_str: str) -> Optional[bytes]:
     """
 
     try:
-        clean_str = ''.join(hex_str.split())
-        if not all(c in '0123456789ABCDEFabcdef' for c in clean_str):
-            return None
-
-        return bytes.fromhex(clean_str)
+        return bytes.fromhex(hex_str)
+    except ValueError:
+        pass
 
-    except Exception:
+    try:
+        return bytes.fromhex(hex_str.translate(_HEX_WHITESPACE))
+    except ValueError:
         pass
 
     return None
@@ -116,6 +144,10 @@ def replace_pattern(data: bytearray, pattern: bytes, replacement: bytes) -> int:
     """
     Replace all occurrences of a pattern in the data.
 
+    Matches are found left to right without overlapping, like
+    `bytes.replace`, which does the whole job in C. When the replacement
+    has the pattern's length the data is overwritten in place instead.
+
     Args:
         data (bytearray): Data to modify
         pattern (bytes): Pattern to replace
@@ -128,16 +160,21 @@ def replace_pattern(data: bytearray, pattern: bytes, replacement: bytes) -> int:
     if not pattern:
         return 0
 
-    count = 0
-    pos = 0
+    if len(replacement) != len(pattern):
+        count = data.count(pattern)
+        if count:
+            data[:] = data.replace(pattern, replacement)
 
-    while True:
-        pos = find_pattern(data, pattern, pos)
-        if pos is None:
-            break
+        return count
+
+    count = 0
+    length = len(pattern)
+    find = data.find
 
-        data[pos:pos + len(pattern)] = replacement
-        pos += len(replacement)
+    pos = find(pattern)
+    while pos >= 0:
+        data[pos:pos + length] = replacement
         count += 1
+        pos = find(pattern, pos + length)
 
     return count
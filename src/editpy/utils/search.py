@@ -3,17 +3,100 @@ Search functionality for the code editor.
 """
 
 import re
-from typing import List, Optional, Tuple
+import functools
+from typing import Any, Final, List, Optional, Tuple
 from ..core.buffer import Buffer, UndoAction
+from .hex_utils import parse_hex_string
+
+try:
+    import re2  # Optional: google-re2 matches in linear time, without backtracking
+except ImportError:
+    re2 = None
+
+_WILDCARD_SPLIT: Final['re.Pattern[str]'] = re.compile(r'([*?])')
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_pattern(pattern: str, flags: int) -> Any:
+    """
+    Compile a regular expression, memoized across searches and search engines.
+
+    Uses the linear-time RE2 engine when google-re2 is installed, so
+    pathological patterns cannot freeze the editor, and falls back to `re`
+    if it is missing or rejects the syntax (e.g. backreferences or lookaround).
+
+    Args:
+        pattern: The regular expression
+        flags: `re` flags; only IGNORECASE and DOTALL are used
+
+    Returns:
+        A compiled pattern object with a `search(string, pos)` method
+    """
+
+    if re2 is not None:
+        options = re2.Options()
+        options.case_sensitive = not flags & re.IGNORECASE
+        options.dot_nl = bool(flags & re.DOTALL)
+        try:
+            return re2.compile(pattern, options)
+        except Exception:
+            pass
+
+    return re.compile(pattern, flags)
+
+
+@functools.lru_cache(maxsize=256)
+def _wildcard_to_regex(pattern: str) -> str:
+    """Translate a wildcard pattern (* and ?) into a regular expression."""
+
+    return ''.join(
+        '.*' if part == '*' else '.' if part == '?' else re.escape(part)
+        for part in _WILDCARD_SPLIT.split(pattern)
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _matches_raw_bytes(text: str) -> bool:
+    """
+    Check whether text matches the raw bytes exactly where it matches the ASCII text.
+
+    Printable bytes look the same in the ASCII representation, so this holds
+    for printable ASCII text without '.', which also stands for non-printable
+    bytes there.
+    """
+
+    return text.isascii() and text.isprintable() and '.' not in text
 
 
 class SearchResult:
-    """Represents a search result with position and match information."""
-    
-    def __init__(self, position: int, length: int, match: bytes):
+    """
+    Represents a search result with position and match information.
+
+    The matched bytes can be given directly or taken from the searched data
+    only when `match` is first read, so collecting many results does not copy
+    every match. Slicing late instead of holding a memoryview keeps the
+    buffer resizable while results are alive.
+    """
+
+    __slots__ = ('position', 'length', '_match', '_source')
+
+    def __init__(self, position: int, length: int, match: Optional[bytes] = None,
+                 source: Any = None) -> None:
         self.position = position
         self.length = length
-        self.match = match
+        self._match = match
+        self._source = source
+
+    @property
+    def match(self) -> bytes:
+        """The matched bytes."""
+
+        if self._match is None:
+            source = self._source
+            self._match = b'' if source is None else bytes(source[self.position:self.position + self.length])
+            self._source = None
+
+        return self._match
 
 
 class SearchEngine:
@@ -26,36 +109,80 @@ class SearchEngine:
     def find_hex(self, pattern: str, start_pos: int = 0) -> Optional[SearchResult]:
         """Search for a hex pattern in binary data."""
 
-        try:
-            hex_bytes = bytes.fromhex(''.join(pattern.split()))
-            pos = self.buffer.data.find(hex_bytes, start_pos)
-
-            if pos >= 0:
-                return SearchResult(pos, len(hex_bytes), hex_bytes)
+        hex_bytes = parse_hex_string(pattern)
+        if hex_bytes is None:
+            return None
 
-        except ValueError:
-            pass
+        pos = self.buffer.data.find(hex_bytes, start_pos)
+        if pos >= 0:
+            return SearchResult(pos, len(hex_bytes), hex_bytes)
 
         return None
 
+    def _text_haystack(self, text: str, case_sensitive: bool) -> Optional[Tuple[Any, Any]]:
+        """
+        Choose what a text search runs over, so every text search shares one path.
+
+        Case-sensitive text accepted by `_matches_raw_bytes` is searched as
+        bytes in the raw data; anything else in the cached ASCII text, lowered
+        together with the text for case-insensitive searches.
+
+        Returns:
+            The haystack and the needle to find in it, or None if the text
+            cannot occur in the ASCII representation at all
+        """
+
+        if case_sensitive and _matches_raw_bytes(text):
+            return self.buffer.data, text.encode('ascii')
+
+        needle = text if case_sensitive else text.lower()
+        if not needle.isascii() or not needle.isprintable():
+            # The ASCII representation only holds printable characters
+            return None
+
+        return self.buffer.get_ascii_text(lower=not case_sensitive), needle
+
     def find_text(self, text: str, case_sensitive: bool = True, start_pos: int = 0) -> Optional[SearchResult]:
         """Search for a text string in the ASCII representation of the buffer."""
 
-        ascii_str = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in self.buffer.data)
+        located = self._text_haystack(text, case_sensitive)
+        if located is None:
+            return None
+
+        haystack, needle = located
+        pos = haystack.find(needle, start_pos)
+        if pos >= 0:
+            return SearchResult(pos, len(text), source=self.buffer.data)
+
+        return None
+
+    def find_hex_reverse(self, pattern: str, end_pos: int) -> Optional[SearchResult]:
+        """Search backwards for the last hex pattern match starting before `end_pos`."""
+
+        hex_bytes = parse_hex_string(pattern)
+        if not hex_bytes or end_pos <= 0:
+            return None
+
+        pos = self.buffer.data.rfind(hex_bytes, 0, end_pos - 1 + len(hex_bytes))
+        if pos >= 0:
+            return SearchResult(pos, len(hex_bytes), hex_bytes)
+
+        return None
 
-        if case_sensitive:
-            pos = ascii_str.find(text, start_pos)
-            if pos >= 0:
-                return SearchResult(pos, len(text), self.buffer.data[pos:pos+len(text)])
+    def find_text_reverse(self, text: str, case_sensitive: bool, end_pos: int) -> Optional[SearchResult]:
+        """Search backwards for the last text match starting before `end_pos`."""
 
+        if end_pos <= 0:
             return None
 
-        search_str = text.lower()
-        ascii_str_lower = ascii_str.lower()
+        located = self._text_haystack(text, case_sensitive)
+        if located is None:
+            return None
 
-        pos = ascii_str_lower.find(search_str, start_pos)
+        haystack, needle = located
+        pos = haystack.rfind(needle, 0, end_pos - 1 + len(needle))
         if pos >= 0:
-            return SearchResult(pos, len(text), self.buffer.data[pos:pos+len(text)])
+            return SearchResult(pos, len(text), source=self.buffer.data)
 
         return None
 
@@ -63,18 +190,15 @@ class SearchEngine:
         """Search using a regular expression pattern in the ASCII representation."""
 
         try:
-            ascii_str = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in self.buffer.data)
+            ascii_str = self.buffer.get_ascii_text()
 
             flags = 0 if case_sensitive else re.IGNORECASE
-            regex = re.compile(pattern, flags)
+            regex = _compile_pattern(pattern, flags)
 
             match = regex.search(ascii_str, start_pos)
             if match:
-                return SearchResult(
-                    match.start(),
-                    match.end() - match.start(),
-                    self.buffer.data[match.start():match.end()]
-                )
+                start, end = match.span()
+                return SearchResult(start, end - start, source=self.buffer.data)
 
         except Exception as e:
             print(f"Regex search error: {e}")
@@ -98,34 +222,15 @@ class SearchEngine:
         if not pattern:
             return None
 
-        ascii_str = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in self.buffer.data)
-
-        regex_pattern = ""
-        for c in pattern:
-            if c == '*':
-                regex_pattern += ".*"
-                continue
-
-            if c == '?':
-                regex_pattern += "."
-                continue
-
-            if c in ('.', '+', '(', ')', '[', ']', '{', '}', '^', '$', '|'):
-                regex_pattern += "\\" + c
-                continue
-
-            regex_pattern += c
+        ascii_str = self.buffer.get_ascii_text()
 
         try:
-            regex = re.compile(regex_pattern, re.DOTALL)
+            regex = _compile_pattern(_wildcard_to_regex(pattern), re.DOTALL)
 
             match = regex.search(ascii_str, start_pos)
             if match:
-                return SearchResult(
-                    match.start(),
-                    match.end() - match.start(),
-                    self.buffer.data[match.start():match.end()]
-                )
+                start, end = match.span()
+                return SearchResult(start, end - start, source=self.buffer.data)
 
         except Exception as e:
             print(f"Wildcard search error: {e}")
@@ -175,6 +280,12 @@ class SearchEngine:
         pattern, search_type, case_sensitive = self.last_search
 
         cursor_pos = self.buffer.cursor_pos
+        if search_type == 'hex':
+            return self.find_hex_reverse(pattern, cursor_pos)
+
+        if search_type not in ('regex', 'wildcard'):
+            return self.find_text_reverse(pattern, case_sensitive, cursor_pos)
+
         last_result = None
         pos = 0
 
@@ -208,18 +319,23 @@ class SearchEngine:
             return False
 
         if search_type == 'hex':
-            try:
-                replacement_bytes = bytes.fromhex(''.join(replacement.split()))
-            except ValueError:
+            replacement_bytes = parse_hex_string(replacement)
+            if replacement_bytes is None:
                 return False
         else:
             replacement_bytes = replacement.encode('utf-8')
 
-        old_data = self.buffer.data[result.position:result.position + result.length]
-        self.buffer.data[result.position:result.position + result.length] = replacement_bytes
+        start = result.position
+        end = start + result.length
+
+        with memoryview(self.buffer.data) as view:
+            old_data = view[start:end].tobytes()
+
+        self.buffer.data[start:end] = replacement_bytes
+        self.buffer.mark_data_changed(start, end if len(replacement_bytes) == result.length else None)
 
         self.buffer.undo_stack.append(UndoAction(
-            position=result.position,
+            position=start,
             old_data=old_data,
             new_data=replacement_bytes,
             action_type='replace'
@@ -242,12 +358,114 @@ class SearchEngine:
             int: Number of replacements made
         """
 
+        if search_type == 'hex':
+            self.last_search = (pattern, search_type, case_sensitive)
+            return self._replace_all_hex(pattern, replacement)
+
         count = 0
         while self.replace_next(pattern, replacement, search_type, case_sensitive):
             count += 1
 
         return count
 
+    def _replace_all_hex(self, pattern: str, replacement: str) -> int:
+        """
+        Replace every hex pattern match from the cursor on in a single forward pass.
+
+        Both hex strings are parsed once, and all matches are collected in
+        the original data before any is replaced, so a replacement that
+        contains the pattern is not matched again. The edit is recorded as a
+        single undo action.
+        """
+
+        hex_bytes = parse_hex_string(pattern)
+        replacement_bytes = parse_hex_string(replacement)
+        if not hex_bytes or replacement_bytes is None:
+            return 0
+
+        spans = []
+        find = self.buffer.data.find
+        length = len(hex_bytes)
+
+        pos = find(hex_bytes, self.buffer.cursor_pos)
+        while pos >= 0:
+            spans.append((pos, pos + length))
+            pos = find(hex_bytes, pos + length)
+
+        action = self.buffer.replace_ranges(spans, replacement_bytes)
+        if action is None:
+            return 0
+
+        self.buffer.undo_stack.append(action)
+        return len(spans)
+
+    def _find_all_text(self, text: str, case_sensitive: bool) -> List[SearchResult]:
+        """Find all occurrences of text with a single `find` loop over one haystack."""
+
+        located = self._text_haystack(text, case_sensitive)
+        if located is None:
+            return []
+
+        haystack, needle = located
+        positions = []
+        find = haystack.find
+
+        pos = find(needle)
+        while pos >= 0:
+            positions.append(pos)
+            pos = find(needle, pos + 1)
+
+        data = self.buffer.data
+        length = len(text)
+        return [SearchResult(pos, length, source=data) for pos in positions]
+
+    def _find_all_hex(self, pattern: str) -> List[SearchResult]:
+        """Find all occurrences of a hex pattern with one parse and a tight `find` loop."""
+
+        needle = parse_hex_string(pattern)
+        if not needle:
+            return []
+
+        positions = []
+        find = self.buffer.data.find
+
+        pos = find(needle)
+        while pos >= 0:
+            positions.append(pos)
+            pos = find(needle, pos + 1)
+
+        length = len(needle)
+        return [SearchResult(pos, length, needle) for pos in positions]
+
+    def _find_all_regex(self, regex: Any) -> List[SearchResult]:
+        """
+        Find all matches of a compiled pattern in the ASCII representation.
+
+        Like repeated `find_next` calls, every position after the start of a
+        match is searched again, so overlapping matches are all reported.
+        """
+
+        data = self.buffer.data
+        text = self.buffer.get_ascii_text()
+        search = regex.search
+
+        results = []
+        pos = 0
+
+        while True:
+            match = search(text, pos)
+            if not match:
+                break
+
+            start, end = match.span()
+            results.append(SearchResult(start, end - start, source=data))
+
+            pos = start + 1
+            if pos >= len(data):
+                break
+
+        return results
+
     def find_all(self, pattern: str, search_type: str = 'text',
                 case_sensitive: bool = False) -> List[SearchResult]:
         """
@@ -267,28 +485,25 @@ class SearchEngine:
 
         self.last_search = (pattern, search_type, case_sensitive)
 
-        results = []
-        pos = 0
+        if search_type == 'hex':
+            return self._find_all_hex(pattern)
 
-        while True:
-            result = None
-
-            if search_type == 'hex':
-                result = self.find_hex(pattern, pos)
-            elif search_type == 'regex':
-                result = self.find_regex(pattern, case_sensitive, pos)
-            elif search_type == 'wildcard':
-                result = self.find_wildcard(pattern, pos)
-            else:
-                result = self.find_text(pattern, case_sensitive, pos)
-
-            if not result:
-                break
+        if search_type == 'regex':
+            try:
+                regex = _compile_pattern(pattern, 0 if case_sensitive else re.IGNORECASE)
+            except Exception as e:
+                print(f"Regex search error: {e}")
+                return []
 
-            results.append(result)
-            pos = result.position + 1
+            return self._find_all_regex(regex)
 
-            if pos >= len(self.buffer.data):
-                break
+        if search_type == 'wildcard':
+            try:
+                regex = _compile_pattern(_wildcard_to_regex(pattern), re.DOTALL)
+            except Exception as e:
+                print(f"Wildcard search error: {e}")
+                return []
 
-        return results
+            return self._find_all_regex(regex)
+
+        return self._find_all_text(pattern, case_sensitive)